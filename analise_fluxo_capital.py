@@ -3,40 +3,23 @@
 Analise do fluxo de capital - AGATA recebe aporte e distribui
 """
 
-import pandas as pd
+from fluxo_loader import BR, carregar_fluxo, contains_cat
 
-def BR(x):
-    return f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+# Carregar fluxo já limpo e normalizado (cache Parquet compartilhado entre os scripts)
+df = carregar_fluxo(colunas=['Grupo', 'Natureza', 'Conta', 'Entrada', 'Saida', 'Saldo'])
 
-# Carregar CSV
-df = pd.read_csv('Fluxo Financeiro.csv', sep=';', encoding='utf-8')
+# Máscara de transferências calculada uma única vez e reutilizada nas seções
+mask_transf = contains_cat(df['Natureza'], 'TRANSF. ENTRE CONTAS', regex=False)
 
-# Limpar nomes de colunas
-df.columns = df.columns.str.replace('Content.', '', regex=False)
+# Colunas numéricas como arrays NumPy: somas mascaradas sem materializar sub-DataFrames
+entrada = df['Entrada'].to_numpy()
+saida = df['Saida'].to_numpy()
+saldo = df['Saldo'].to_numpy()
+mask_transf_np = mask_transf.to_numpy()
+mask_conta_agata = (df['Conta'] == 'FluxoAgata').to_numpy()
 
-# Limpar valores monetários
-def limpar_valor(valor_str):
-    if pd.isna(valor_str) or valor_str == '':
-        return 0.0
-    valor_limpo = str(valor_str).strip().replace('.', '').replace(',', '.')
-    try:
-        return float(valor_limpo)
-    except:
-        return 0.0
-
-df['Entrada'] = df['Entrada (R$)'].apply(limpar_valor)
-df['Saida'] = df['Saída (R$)'].apply(limpar_valor)
-
-# Garantir que saída seja negativa
-df.loc[df['Saida'] > 0, 'Saida'] = -df.loc[df['Saida'] > 0, 'Saida'].abs()
-
-# Calcular saldo
-df['Saldo'] = df['Entrada'] + df['Saida']
-
-# Normalizar textos
-df['Natureza'] = df['Natureza'].fillna('').str.upper()
-df['Conta'] = df['Name'].fillna('').str.strip()
-df['Grupo'] = df['Grupo'].fillna('').str.upper()
+# Entradas de transferências originadas na AGATA (seção 3), também calculada uma vez
+mask_transf_agata_in = mask_transf_np & contains_cat(df['Natureza'], 'AGATA', regex=False).to_numpy() & (entrada > 0)
 
 print("="*80)
 print("ANALISE: FLUXO DE CAPITAL - AGATA RECEBE APORTE E DISTRIBUI")
@@ -47,15 +30,16 @@ print("\n" + "="*80)
 print("1. APORTE SCP NA CONTA AGATA")
 print("="*80)
 
-df_aporte = df[
-    (df['Natureza'].str.contains('APORTE', na=False)) &
+mask_aporte = (
+    contains_cat(df['Natureza'], 'APORTE', regex=False) &
     (df['Grupo'] == 'AGATA')
-].copy()
+).to_numpy()
+num_aporte = int(mask_aporte.sum())
 
-if len(df_aporte) > 0:
-    total_aporte = df_aporte['Entrada'].sum()
+if num_aporte > 0:
+    total_aporte = entrada[mask_aporte].sum()
     print(f"\nTotal de Aportes SCP recebidos por AGATA: {BR(total_aporte)}")
-    print(f"Numero de transacoes: {len(df_aporte)}")
+    print(f"Numero de transacoes: {num_aporte}")
 else:
     print("\nNenhum aporte encontrado diretamente na AGATA")
 
@@ -64,27 +48,24 @@ print("\n" + "="*80)
 print("2. TRANSFERENCIAS ORIGINADAS NA CONTA AGATA (FluxoAgata)")
 print("="*80)
 
-df_transf_agata = df[
-    (df['Conta'] == 'FluxoAgata') &
-    (df['Natureza'].str.contains('TRANSF. ENTRE CONTAS', na=False))
-].copy()
+mask_transf_agata = mask_conta_agata & mask_transf_np
 
-print(f"\nTotal de transacoes de transferencia em FluxoAgata: {len(df_transf_agata)}")
+print(f"\nTotal de transacoes de transferencia em FluxoAgata: {int(mask_transf_agata.sum())}")
 
 # Separar o que SAIU da Agata
-df_agata_saida = df_transf_agata[df_transf_agata['Saida'] < 0].copy()
+mask_agata_saida = mask_transf_agata & (saida < 0)
 print(f"\nTRANSFERENCIAS QUE SAIRAM DA AGATA:")
-print(f"  Total enviado: {BR(abs(df_agata_saida['Saida'].sum()))}")
-print(f"  Numero de transferencias: {len(df_agata_saida)}")
+print(f"  Total enviado: {BR(-saida[mask_agata_saida].sum())}")
+print(f"  Numero de transferencias: {int(mask_agata_saida.sum())}")
 
 # Separar o que ENTROU na Agata
-df_agata_entrada = df_transf_agata[df_transf_agata['Entrada'] > 0].copy()
+mask_agata_entrada = mask_transf_agata & (entrada > 0)
 print(f"\nTRANSFERENCIAS QUE ENTRARAM NA AGATA:")
-print(f"  Total recebido: {BR(df_agata_entrada['Entrada'].sum())}")
-print(f"  Numero de transferencias: {len(df_agata_entrada)}")
+print(f"  Total recebido: {BR(entrada[mask_agata_entrada].sum())}")
+print(f"  Numero de transferencias: {int(mask_agata_entrada.sum())}")
 
 # Líquido
-liquido_transf_agata = df_transf_agata['Saldo'].sum()
+liquido_transf_agata = saldo[mask_transf_agata].sum()
 print(f"\nLIQUIDO DE TRANSFERENCIAS NA AGATA: {BR(liquido_transf_agata)}")
 
 # 3. Para onde foi o dinheiro da AGATA?
@@ -93,17 +74,18 @@ print("3. DESTINOS DAS TRANSFERENCIAS DA AGATA")
 print("="*80)
 
 # Buscar transferências que vieram de AGATA em outras contas
-for conta in ['FluxoLifecon5', 'FluxoLifecon7', 'FluxoBariloche']:
-    df_recebidas = df[
-        (df['Conta'] == conta) &
-        (df['Natureza'].str.contains('TRANSF. ENTRE CONTAS', na=False)) &
-        (df['Natureza'].str.contains('AGATA', na=False)) &
-        (df['Entrada'] > 0)
-    ]
-    
-    if len(df_recebidas) > 0:
-        total = df_recebidas['Entrada'].sum()
-        print(f"\n{conta} recebeu de AGATA: {BR(total)} ({len(df_recebidas)} transacoes)")
+# (uma única agregação soma+contagem por Conta sobre a máscara pré-calculada)
+contas_destino = ['FluxoLifecon5', 'FluxoLifecon7', 'FluxoBariloche']
+recebidas = (
+    df.loc[mask_transf_agata_in]
+    .groupby('Conta', observed=True)['Entrada']
+    .agg(['sum', 'size'])
+    .reindex(contas_destino, fill_value=0)
+)
+
+for conta, total, num in recebidas.itertuples():
+    if num > 0:
+        print(f"\n{conta} recebeu de AGATA: {BR(total)} ({num} transacoes)")
 
 # 4. Análise completa do fluxo de capital
 print("\n" + "="*80)
@@ -111,24 +93,25 @@ print("4. FLUXO COMPLETO DE CAPITAL")
 print("="*80)
 
 # AGATA - Visão completa (não apenas transferências)
-df_agata_completo = df[df['Conta'] == 'FluxoAgata'].copy()
-
-total_entrada_agata = df_agata_completo['Entrada'].sum()
-total_saida_agata = df_agata_completo['Saida'].sum()
-saldo_agata = df_agata_completo['Saldo'].sum()
+total_entrada_agata = entrada[mask_conta_agata].sum()
+total_saida_agata = saida[mask_conta_agata].sum()
+saldo_agata = saldo[mask_conta_agata].sum()
 
 print(f"\nCONTA AGATA (FluxoAgata) - VISAO COMPLETA:")
 print(f"  Total Entradas:  {BR(total_entrada_agata)}")
-print(f"  Total Saidas:    {BR(abs(total_saida_agata))}")
+print(f"  Total Saidas:    {BR(-total_saida_agata)}")
 print(f"  Saldo Final:     {BR(saldo_agata)}")
 
 # Decompor as entradas
-df_agata_entradas = df_agata_completo[df_agata_completo['Entrada'] > 0].copy()
+df_agata_entradas = df[mask_conta_agata & (entrada > 0)]
 
 print(f"\n  COMPOSICAO DAS ENTRADAS:")
-for natureza in df_agata_entradas['Natureza'].unique():
-    df_nat = df_agata_entradas[df_agata_entradas['Natureza'] == natureza]
-    total = df_nat['Entrada'].sum()
+totais_natureza = (
+    df_agata_entradas.groupby('Natureza', observed=True)['Entrada']
+    .sum()
+    .sort_values(ascending=False)
+)
+for natureza, total in totais_natureza.items():
     print(f"    {natureza[:60]:60} {BR(total)}")
 
 # 5. Reconciliação: De onde vem os R$ 90.074,15?
@@ -153,15 +136,13 @@ print("6. FLUXO DE CAPITAL CONSOLIDADO")
 print("="*80)
 
 # Todas as transferências
-df_transf_all = df[df['Natureza'].str.contains('TRANSF. ENTRE CONTAS', na=False)].copy()
-
-entrada_transf_total = df_transf_all['Entrada'].sum()
-saida_transf_total = df_transf_all['Saida'].sum()
-liquido_transf_total = df_transf_all['Saldo'].sum()
+entrada_transf_total = entrada[mask_transf_np].sum()
+saida_transf_total = saida[mask_transf_np].sum()
+liquido_transf_total = saldo[mask_transf_np].sum()
 
 print(f"\nTOTAL DE TRANSFERENCIAS NO SISTEMA:")
 print(f"  Entradas:  {BR(entrada_transf_total)}")
-print(f"  Saidas:    {BR(abs(saida_transf_total))}")
+print(f"  Saidas:    {BR(-saida_transf_total)}")
 print(f"  Liquido:   {BR(liquido_transf_total)}")
 
 print("\n" + "="*80)
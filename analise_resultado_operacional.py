@@ -4,47 +4,42 @@ Analise detalhada do resultado operacional de R$ 15.467,43
 Vamos descobrir o que esta sendo considerado como "operacional"
 """
 
-import pandas as pd
+import re
 
-def BR(x):
-    return f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+from fluxo_loader import BR, BR_series, carregar_fluxo, contains_cat
 
-# Carregar CSV
-df = pd.read_csv('Fluxo Financeiro.csv', sep=';', encoding='utf-8')
+def imprimir_linhas(linhas):
+    """Imprime um bloco de linhas já formatadas numa única chamada"""
+    if linhas:
+        print('\n'.join(linhas))
 
-# Limpar nomes de colunas
-df.columns = df.columns.str.replace('Content.', '', regex=False)
-
-# Limpar valores monetários
-def limpar_valor(valor_str):
-    if pd.isna(valor_str) or valor_str == '':
-        return 0.0
-    valor_limpo = str(valor_str).strip().replace('.', '').replace(',', '.')
-    try:
-        return float(valor_limpo)
-    except:
-        return 0.0
-
-df['Entrada'] = df['Entrada (R$)'].apply(limpar_valor)
-df['Saida'] = df['Saída (R$)'].apply(limpar_valor)
-
-# Garantir que saída seja negativa
-df.loc[df['Saida'] > 0, 'Saida'] = -df.loc[df['Saida'] > 0, 'Saida'].abs()
-
-# Calcular saldo
-df['Saldo'] = df['Entrada'] + df['Saida']
-
-# Normalizar textos
-df['Natureza'] = df['Natureza'].fillna('').str.upper()
-df['Subgrupo'] = df['Subgrupo'].fillna('').str.upper()
-df['Grupo'] = df['Grupo'].fillna('').str.upper()
+# Carregar fluxo já limpo e normalizado SEM transferências (como o dashboard faz);
+# o filtro é aplicado na própria leitura do cache Parquet
+df_sem_transf = carregar_fluxo(
+    colunas=['Grupo', 'Subgrupo', 'Natureza', 'Entrada', 'Saida', 'Saldo'],
+    sem_transferencias=True
+)
 
 print("="*80)
 print("ANALISE: O QUE E O RESULTADO OPERACIONAL DE R$ 15.467,43?")
 print("="*80)
 
-# Filtrar SEM transferências (como o dashboard faz)
-df_sem_transf = df[~df['Natureza'].str.contains('TRANSF. ENTRE CONTAS', na=False)].copy()
+# Máscaras de classificação calculadas uma única vez sobre df_sem_transf
+# (uma varredura por padrão; literais com regex=False, alternâncias pré-compiladas)
+RE_REC_FIN = re.compile('RECEITA APLICACOES|OUTRAS RECEITAS FINANCEIRAS')
+RE_NAO_OPERACIONAL = re.compile(
+    'APORTE|EMPRESTIMO|RECEITA APLICACOES|OUTRAS RECEITAS FINANCEIRAS|'
+    r'RESULTADO DE PARTIC\. SOCIETARIAS'
+)
+natureza_sem_transf = df_sem_transf['Natureza']
+mask_aporte = contains_cat(natureza_sem_transf, 'APORTE', regex=False).to_numpy()
+mask_emprestimo = contains_cat(natureza_sem_transf, 'EMPRESTIMO', regex=False).to_numpy()
+mask_rec_fin = contains_cat(natureza_sem_transf, RE_REC_FIN).to_numpy()
+mask_nao_operacional = contains_cat(natureza_sem_transf, RE_NAO_OPERACIONAL).to_numpy()
+
+# Arrays NumPy para somas mascaradas sem materializar sub-DataFrames
+entrada_st = df_sem_transf['Entrada'].to_numpy()
+saida_st = df_sem_transf['Saida'].to_numpy()
 
 print(f"\nTotal de transacoes (sem transferencias): {len(df_sem_transf)}")
 
@@ -54,7 +49,7 @@ total_saida = df_sem_transf['Saida'].sum()
 saldo = df_sem_transf['Saldo'].sum()
 
 print(f"\nTOTAL ENTRADAS (sem transferencias):  {BR(total_entrada)}")
-print(f"TOTAL SAIDAS (sem transferencias):    {BR(abs(total_saida))}")
+print(f"TOTAL SAIDAS (sem transferencias):    {BR(-total_saida)}")
 print(f"SALDO (sem transferencias):           {BR(saldo)}")
 
 # Agora vamos decompor as ENTRADAS
@@ -62,45 +57,70 @@ print("\n" + "="*80)
 print("DECOMPOSICAO DAS ENTRADAS (SEM TRANSFERENCIAS)")
 print("="*80)
 
-df_entradas = df_sem_transf[df_sem_transf['Entrada'] > 0].copy()
+# Entrada >= 0 e Saida <= 0 em todas as linhas: somar sem pré-filtrar dá o mesmo
+# total, bastando descartar depois os grupos sem movimento no sentido analisado
 
 # Agrupar por Subgrupo e Natureza
-entrada_por_natureza = df_entradas.groupby(['Subgrupo', 'Natureza'])['Entrada'].sum().reset_index()
+entrada_por_natureza = df_sem_transf.groupby(['Subgrupo', 'Natureza'], observed=True)['Entrada'].sum().reset_index()
+entrada_por_natureza = entrada_por_natureza[entrada_por_natureza['Entrada'] > 0]
 entrada_por_natureza = entrada_por_natureza.sort_values('Entrada', ascending=False)
+entrada_por_natureza['Entrada_BR'] = BR_series(entrada_por_natureza['Entrada'])
 
 print(f"\n{'SUBGRUPO':<30} {'NATUREZA':<50} {'VALOR':>20}")
 print("-"*100)
 
-for _, row in entrada_por_natureza.iterrows():
-    print(f"{row['Subgrupo']:<30} {row['Natureza'][:50]:<50} {BR(row['Entrada']):>20}")
+imprimir_linhas([
+    f"{sg:<30} {nat[:50]:<50} {br:>20}"
+    for sg, nat, br in zip(
+        entrada_por_natureza['Subgrupo'],
+        entrada_por_natureza['Natureza'],
+        entrada_por_natureza['Entrada_BR']
+    )
+])
 
 # Totais por subgrupo
 print("\n" + "="*80)
 print("TOTAIS POR SUBGRUPO (ENTRADAS)")
 print("="*80)
 
-entrada_por_subgrupo = df_entradas.groupby('Subgrupo')['Entrada'].sum().reset_index()
+# Entradas e saídas por subgrupo numa única agregação
+por_subgrupo = df_sem_transf.groupby('Subgrupo', observed=True).agg(
+    Entrada=('Entrada', 'sum'),
+    Saida=('Saida', 'sum')
+).reset_index()
+
+entrada_por_subgrupo = por_subgrupo.loc[por_subgrupo['Entrada'] > 0, ['Subgrupo', 'Entrada']]
 entrada_por_subgrupo = entrada_por_subgrupo.sort_values('Entrada', ascending=False)
+entrada_por_subgrupo['Entrada_BR'] = BR_series(entrada_por_subgrupo['Entrada'])
 
-for _, row in entrada_por_subgrupo.iterrows():
-    percentual = (row['Entrada'] / total_entrada * 100)
-    print(f"{row['Subgrupo']:<40} {BR(row['Entrada']):>20} ({percentual:>5.1f}%)")
+imprimir_linhas([
+    f"{sg:<40} {br:>20} ({p:>5.1f}%)"
+    for sg, br, p in zip(
+        entrada_por_subgrupo['Subgrupo'],
+        entrada_por_subgrupo['Entrada_BR'],
+        entrada_por_subgrupo['Entrada'] / total_entrada * 100
+    )
+])
 
 # Agora vamos decompor as SAÍDAS
 print("\n" + "="*80)
 print("DECOMPOSICAO DAS SAIDAS (SEM TRANSFERENCIAS)")
 print("="*80)
 
-df_saidas = df_sem_transf[df_sem_transf['Saida'] < 0].copy()
-
-# Totais por subgrupo
-saida_por_subgrupo = df_saidas.groupby('Subgrupo')['Saida'].sum().reset_index()
-saida_por_subgrupo['Saida_Abs'] = saida_por_subgrupo['Saida'].abs()
-saida_por_subgrupo = saida_por_subgrupo.sort_values('Saida_Abs', ascending=False)
-
-for _, row in saida_por_subgrupo.iterrows():
-    percentual = (row['Saida_Abs'] / abs(total_saida) * 100)
-    print(f"{row['Subgrupo']:<40} {BR(row['Saida_Abs']):>20} ({percentual:>5.1f}%)")
+# Totais por subgrupo (da agregação conjunta acima)
+saida_por_subgrupo = por_subgrupo.loc[por_subgrupo['Saida'] < 0, ['Subgrupo', 'Saida']]
+# Saida já é <= 0: ordenar crescente equivale a maior valor absoluto primeiro
+saida_por_subgrupo = saida_por_subgrupo.sort_values('Saida', ascending=True)
+saida_por_subgrupo['Saida_BR'] = BR_series(-saida_por_subgrupo['Saida'])
+
+imprimir_linhas([
+    f"{sg:<40} {br:>20} ({p:>5.1f}%)"
+    for sg, br, p in zip(
+        saida_por_subgrupo['Subgrupo'],
+        saida_por_subgrupo['Saida_BR'],
+        saida_por_subgrupo['Saida'] / total_saida * 100
+    )
+])
 
 # Análise crítica: O que é REALMENTE operacional?
 print("\n" + "="*80)
@@ -112,22 +132,19 @@ print("  - TUDO que NAO seja 'TRANSF. ENTRE CONTAS'")
 print("\nIsso INCLUI:")
 
 # Verificar se aporte está sendo contado
-df_aporte = df_sem_transf[df_sem_transf['Natureza'].str.contains('APORTE', na=False)]
-if len(df_aporte) > 0:
-    total_aporte = df_aporte['Entrada'].sum()
+if mask_aporte.any():
+    total_aporte = entrada_st[mask_aporte].sum()
     print(f"  [X] APORTE DE CAPITAL SCP: {BR(total_aporte)} <- NAO E OPERACIONAL!")
 
 # Verificar empréstimos
-df_emprestimos = df_sem_transf[df_sem_transf['Natureza'].str.contains('EMPRESTIMO', na=False)]
-if len(df_emprestimos) > 0:
-    entrada_emp = df_emprestimos['Entrada'].sum()
-    saida_emp = df_emprestimos['Saida'].sum()
-    print(f"  [X] EMPRESTIMOS Entrada: {BR(entrada_emp)}, Saida: {BR(abs(saida_emp))} <- NAO E OPERACIONAL!")
+if mask_emprestimo.any():
+    entrada_emp = entrada_st[mask_emprestimo].sum()
+    saida_emp = saida_st[mask_emprestimo].sum()
+    print(f"  [X] EMPRESTIMOS Entrada: {BR(entrada_emp)}, Saida: {BR(-saida_emp)} <- NAO E OPERACIONAL!")
 
 # Verificar receitas financeiras
-df_rec_fin = df_sem_transf[df_sem_transf['Natureza'].str.contains('RECEITA APLICACOES|OUTRAS RECEITAS FINANCEIRAS', na=False)]
-if len(df_rec_fin) > 0:
-    total_rec_fin = df_rec_fin['Entrada'].sum()
+if mask_rec_fin.any():
+    total_rec_fin = entrada_st[mask_rec_fin].sum()
     print(f"  [X] RECEITAS FINANCEIRAS: {BR(total_rec_fin)} <- FINANCEIRO, nao operacional")
 
 # Calcular o VERDADEIRO resultado operacional
@@ -136,24 +153,15 @@ print("CALCULO DO VERDADEIRO RESULTADO OPERACIONAL")
 print("="*80)
 
 # Receitas operacionais = vendas, serviços, etc (excluir aporte, empréstimos, receitas financeiras)
-df_receitas_op = df_sem_transf[
-    (df_sem_transf['Entrada'] > 0) &
-    (~df_sem_transf['Natureza'].str.contains('APORTE', na=False)) &
-    (~df_sem_transf['Natureza'].str.contains('EMPRESTIMO', na=False)) &
-    (~df_sem_transf['Natureza'].str.contains('RECEITA APLICACOES', na=False)) &
-    (~df_sem_transf['Natureza'].str.contains('OUTRAS RECEITAS FINANCEIRAS', na=False)) &
-    (~df_sem_transf['Natureza'].str.contains('RESULTADO DE PARTIC. SOCIETARIAS', na=False))
-].copy()
+mask_receitas_op = (entrada_st > 0) & ~mask_nao_operacional
+df_receitas_op = df_sem_transf[mask_receitas_op]
 
-receitas_operacionais = df_receitas_op['Entrada'].sum()
+receitas_operacionais = entrada_st[mask_receitas_op].sum()
 
 # Despesas operacionais = todas as saídas exceto empréstimos pagos
-df_despesas_op = df_sem_transf[
-    (df_sem_transf['Saida'] < 0) &
-    (~df_sem_transf['Natureza'].str.contains('EMPRESTIMO', na=False))
-].copy()
+mask_despesas_op = (saida_st < 0) & ~mask_emprestimo
 
-despesas_operacionais = abs(df_despesas_op['Saida'].sum())
+despesas_operacionais = -saida_st[mask_despesas_op].sum()
 
 resultado_operacional_real = receitas_operacionais - despesas_operacionais
 
@@ -163,7 +171,7 @@ print(f"{'='*80}")
 print(f"RESULTADO OPERACIONAL REAL:                {BR(resultado_operacional_real)}")
 
 if resultado_operacional_real < 0:
-    print(f"\n[!] PREJUIZO OPERACIONAL: {BR(abs(resultado_operacional_real))}")
+    print(f"\n[!] PREJUIZO OPERACIONAL: {BR(-resultado_operacional_real)}")
 else:
     print(f"\n[OK] LUCRO OPERACIONAL: {BR(resultado_operacional_real)}")
 
@@ -172,11 +180,14 @@ print("\n" + "="*80)
 print("PRINCIPAIS RECEITAS OPERACIONAIS")
 print("="*80)
 
-receitas_por_natureza = df_receitas_op.groupby('Natureza')['Entrada'].sum().reset_index()
-receitas_por_natureza = receitas_por_natureza.sort_values('Entrada', ascending=False)
+receitas_por_natureza = df_receitas_op.groupby('Natureza', observed=True)['Entrada'].sum().reset_index()
+receitas_por_natureza = receitas_por_natureza.sort_values('Entrada', ascending=False).head(10)
+receitas_por_natureza['Entrada_BR'] = BR_series(receitas_por_natureza['Entrada'])
 
-for _, row in receitas_por_natureza.head(10).iterrows():
-    print(f"  {row['Natureza'][:60]:<60} {BR(row['Entrada']):>20}")
+imprimir_linhas([
+    f"  {nat[:60]:<60} {br:>20}"
+    for nat, br in zip(receitas_por_natureza['Natureza'], receitas_por_natureza['Entrada_BR'])
+])
 
 print("\n" + "="*80)
 print("CONCLUSAO")
@@ -1,105 +1,105 @@
 # Lendo e somando os valores informados (Entradas e Saídas) para conferir o caixa e analisar o delta de R$ 90.074,15
-from decimal import Decimal, getcontext
+import numpy as np
 
-getcontext().prec = 12
-
-def BR(x: Decimal) -> str:
+def BR(x: float) -> str:
+    # Arredonda ao centavo só na impressão (+ 0.0 evita exibir "-0,00")
+    x = round(float(x), 2) + 0.0
     return f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
 
-entradas = [
+entradas = np.array([
     # Entradas
-    Decimal('3484400.00'),  # ÁGATA – APORTE DE CAPITAL SCP
-    Decimal('2618995.30'),  # NORTHSIDE – TRANSF. ENTRE CONTAS AGATA (ENTRADA)
-    Decimal('660108.90'),   # NORTHSIDE – RECEITAS DE VENDA DE IMÓVEIS
-    Decimal('390366.46'),   # NORTHSIDE – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
-    Decimal('348876.63'),   # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
-    Decimal('222510.00'),   # BARILOCHE – TRANSF. ENTRE CONTAS ÁGATA (ENTRADA)
-    Decimal('50000.00'),    # ÁGATA – EMPRÉSTIMOS (ENTRADA)
-    Decimal('37120.07'),    # ÁGATA – TRANSF. ENTRE CONTAS ÁGATA (ENTRADA)
-    Decimal('7100.00'),     # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (SAIDA) -> listado em Entradas (conforme dado)
-    Decimal('5000.00'),     # BARILOCHE – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
-    Decimal('4391.53'),     # ÁGATA – RECEITA APLICAÇÕES FINANCEIRAS
-    Decimal('1817.34'),     # BARILOCHE – TRANSF. ENTRE CONTAS BARILOCHE (ENTRADA)
-    Decimal('1558.30'),     # BARILOCHE – OUTRAS RECEITAS FINANCEIRAS
-    Decimal('1482.36'),     # NORTHSIDE – RECEITA APLICAÇÕES FINANCEIRAS
-    Decimal('31.52'),       # BARILOCHE – RECEITA APLICAÇÕES FINANCEIRAS
-    Decimal('10.61'),       # NORTHSIDE – OUTRAS RECEITAS FINANCEIRAS
-    Decimal('0.01'),        # BARILOCHE – TAXAS BANCÁRIAS (entrada)
-]
+    3484400.00,  # ÁGATA – APORTE DE CAPITAL SCP
+    2618995.30,  # NORTHSIDE – TRANSF. ENTRE CONTAS AGATA (ENTRADA)
+    660108.90,   # NORTHSIDE – RECEITAS DE VENDA DE IMÓVEIS
+    390366.46,   # NORTHSIDE – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
+    348876.63,   # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
+    222510.00,   # BARILOCHE – TRANSF. ENTRE CONTAS ÁGATA (ENTRADA)
+    50000.00,    # ÁGATA – EMPRÉSTIMOS (ENTRADA)
+    37120.07,    # ÁGATA – TRANSF. ENTRE CONTAS ÁGATA (ENTRADA)
+    7100.00,     # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (SAIDA) -> listado em Entradas (conforme dado)
+    5000.00,     # BARILOCHE – TRANSF. ENTRE CONTAS LIFECON (ENTRADA)
+    4391.53,     # ÁGATA – RECEITA APLICAÇÕES FINANCEIRAS
+    1817.34,     # BARILOCHE – TRANSF. ENTRE CONTAS BARILOCHE (ENTRADA)
+    1558.30,     # BARILOCHE – OUTRAS RECEITAS FINANCEIRAS
+    1482.36,     # NORTHSIDE – RECEITA APLICAÇÕES FINANCEIRAS
+    31.52,       # BARILOCHE – RECEITA APLICAÇÕES FINANCEIRAS
+    10.61,       # NORTHSIDE – OUTRAS RECEITAS FINANCEIRAS
+    0.01,        # BARILOCHE – TAXAS BANCÁRIAS (entrada)
+], dtype=np.float64)
 
-saidas = [
+saidas = np.array([
     # Saídas
-    Decimal('2468995.30'),  # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (SAIDA)
-    Decimal('1260705.02'),  # NORTHSIDE – OBRAS DE INFRAESTRUTURA
-    Decimal('593993.45'),   # NORTHSIDE – OBRAS DE EDIFICAÇÕES
-    Decimal('450292.31'),   # NORTHSIDE – TRANSF. ENTRE CONTAS LIFECON (SAIDA)
-    Decimal('235680.02'),   # NORTHSIDE – IPTU / ITR
-    Decimal('226876.63'),   # NORTHSIDE – TRANSF. ENTRE CONTAS ÁGATA (SAIDA)
-    Decimal('222510.00'),   # ÁGATA – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
-    Decimal('220000.00'),   # NORTHSIDE – COMISSÃO/INTERMEDIAÇÃO
-    Decimal('193464.44'),   # NORTHSIDE – ASSESSORIA TÉCNICA
-    Decimal('168406.25'),   # NORTHSIDE – RESULTADO DE PARTIC. SOCIETÁRIAS (PAGAR)
-    Decimal('159120.07'),   # ÁGATA – TRANSF. ENTRE CONTAS ÁGATA (SAIDA)
-    Decimal('139331.61'),   # NORTHSIDE – MATERIAL ELÉTRICO
-    Decimal('121249.58'),   # BARILOCHE – MURO DE CONTENÇÃO
-    Decimal('113290.58'),   # BARILOCHE – CUSTO DA ÁREA
-    Decimal('104005.42'),   # NORTHSIDE – PROJETOS COMPLEMENTARES
-    Decimal('85146.50'),    # NORTHSIDE – MARKETING
-    Decimal('84114.69'),    # NORTHSIDE – IMPOSTOS (ISSQN, IRRF...)
-    Decimal('79924.20'),    # ÁGATA – ASSESSORIA DE INFORMÁTICA
-    Decimal('66152.21'),    # NORTHSIDE – ASSESSORIA CONTÁBIL
-    Decimal('63494.32'),    # NORTHSIDE – PROJETOS AMBIENTAIS
-    Decimal('62696.52'),    # ÁGATA – ASSESSORIA TÉCNICA
-    Decimal('54106.00'),    # NORTHSIDE – EXECUÇÃO SISTEMA DE ELETRIFICAÇÃO
-    Decimal('50000.00'),    # ÁGATA – EMPRÉSTIMOS (SAIDA)
-    Decimal('49201.84'),    # NORTHSIDE – PROJETOS URBANÍSTICOS
-    Decimal('46119.68'),    # NORTHSIDE – DESPESAS INICIAIS
-    Decimal('44497.83'),    # BARILOCHE – IPTU / ITR
-    Decimal('41592.66'),    # ÁGATA – ASSESSORIA CONTÁBIL
-    Decimal('32943.70'),    # NORTHSIDE – CUSTO DA ÁREA (ROÇADA...)
-    Decimal('31409.24'),    # NORTHSIDE – SUPRESSÃO VEGETAL
-    Decimal('28995.30'),    # BARILOCHE – TAXAS E IMPOSTOS (ITBI...)
-    Decimal('26232.79'),    # BARILOCHE – PROJETOS DE EDIFICAÇÕES
-    Decimal('23013.17'),    # NORTHSIDE – PROJETOS DE EDIFICAÇÕES
-    Decimal('18950.00'),    # BARILOCHE – ASSESSORIA CONTÁBIL
-    Decimal('18402.78'),    # BARILOCHE – FORNECIMENTO DE MATERIAL
-    Decimal('17980.00'),    # BARILOCHE – LIMPEZA DE ÁREA E TERRAPLANAGEM
-    Decimal('13544.74'),    # NORTHSIDE – COFINS
-    Decimal('13220.59'),    # NORTHSIDE – REGISTRO DE IMÓVEIS
-    Decimal('11164.96'),    # NORTHSIDE – CSLL IRPJ
-    Decimal('8212.40'),     # BARILOCHE – DESPESAS INICIAIS
-    Decimal('7390.28'),     # ÁGATA – TAXAS BANCÁRIAS
-    Decimal('7300.00'),     # NORTHSIDE – SERVIÇOS DE TOPOGRAFIA
-    Decimal('7100.00'),     # NORTHSIDE – TRANSF. ENTRE CONTAS AGATA (SAIDA)
-    Decimal('5000.00'),     # NORTHSIDE – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
-    Decimal('4472.22'),     # ÁGATA – TAXAS E CONTRIBUIÇÕES
-    Decimal('4200.00'),     # NORTHSIDE – DESPESAS LEGAIS, CARTORIAIS...
-    Decimal('3926.26'),     # NORTHSIDE – TAXAS BANCÁRIAS
-    Decimal('3503.73'),     # BARILOCHE – DESPESAS LEGAIS, CARTORIAIS...
-    Decimal('3484.40'),     # BARILOCHE – LOCAÇÃO DE APOIO
-    Decimal('3451.61'),     # BARILOCHE – CONSUMO DE ÁGUA E ENERGIA
-    Decimal('2934.69'),     # NORTHSIDE – PIS
-    Decimal('2842.35'),     # NORTHSIDE – SEGURANÇA
-    Decimal('2765.04'),     # ÁGATA – OUTRAS DESPESAS
-    Decimal('2600.86'),     # NORTHSIDE – CONSUMO DE ÁGUA E ENERGIA
-    Decimal('2096.62'),     # BARILOCHE – SERVIÇOS DE TOPOGRAFIA
-    Decimal('2042.78'),     # NORTHSIDE – TAXAS E CONTRIBUIÇÕES
-    Decimal('1977.76'),     # ÁGATA – VIAGEM
-    Decimal('1817.34'),     # BARILOCHE – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
-    Decimal('1595.87'),     # BARILOCHE – TAXAS BANCÁRIAS
-    Decimal('1530.00'),     # BARILOCHE – PROJETOS AMBIENTAIS
-    Decimal('1500.00'),     # BARILOCHE – ASSESSORIA TÉCNICA
-    Decimal('1334.06'),     # NORTHSIDE – PLACAS DE OBRAS, SINALIZAÇÃO
-    Decimal('1260.36'),     # BARILOCHE – TAXAS E CONTRIBUIÇÕES
-    Decimal('1220.00'),     # ÁGATA – BENS DE PEQUENO VALOR
-    Decimal('975.69'),      # ÁGATA – ASSINATURA DIGITAL, CERTIFICAÇÃO
-    Decimal('550.00'),      # NORTHSIDE – ASSESSORIA JURÍDICA
-    Decimal('206.91'),      # NORTHSIDE – ASSINATURA DIGITAL, CERTIFICAÇÃO
-    Decimal('111.82'),      # BARILOCHE – IMPOSTOS (ISSQN, IRRF...)
-]
+    2468995.30,  # ÁGATA – TRANSF. ENTRE CONTAS LIFECON (SAIDA)
+    1260705.02,  # NORTHSIDE – OBRAS DE INFRAESTRUTURA
+    593993.45,   # NORTHSIDE – OBRAS DE EDIFICAÇÕES
+    450292.31,   # NORTHSIDE – TRANSF. ENTRE CONTAS LIFECON (SAIDA)
+    235680.02,   # NORTHSIDE – IPTU / ITR
+    226876.63,   # NORTHSIDE – TRANSF. ENTRE CONTAS ÁGATA (SAIDA)
+    222510.00,   # ÁGATA – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
+    220000.00,   # NORTHSIDE – COMISSÃO/INTERMEDIAÇÃO
+    193464.44,   # NORTHSIDE – ASSESSORIA TÉCNICA
+    168406.25,   # NORTHSIDE – RESULTADO DE PARTIC. SOCIETÁRIAS (PAGAR)
+    159120.07,   # ÁGATA – TRANSF. ENTRE CONTAS ÁGATA (SAIDA)
+    139331.61,   # NORTHSIDE – MATERIAL ELÉTRICO
+    121249.58,   # BARILOCHE – MURO DE CONTENÇÃO
+    113290.58,   # BARILOCHE – CUSTO DA ÁREA
+    104005.42,   # NORTHSIDE – PROJETOS COMPLEMENTARES
+    85146.50,    # NORTHSIDE – MARKETING
+    84114.69,    # NORTHSIDE – IMPOSTOS (ISSQN, IRRF...)
+    79924.20,    # ÁGATA – ASSESSORIA DE INFORMÁTICA
+    66152.21,    # NORTHSIDE – ASSESSORIA CONTÁBIL
+    63494.32,    # NORTHSIDE – PROJETOS AMBIENTAIS
+    62696.52,    # ÁGATA – ASSESSORIA TÉCNICA
+    54106.00,    # NORTHSIDE – EXECUÇÃO SISTEMA DE ELETRIFICAÇÃO
+    50000.00,    # ÁGATA – EMPRÉSTIMOS (SAIDA)
+    49201.84,    # NORTHSIDE – PROJETOS URBANÍSTICOS
+    46119.68,    # NORTHSIDE – DESPESAS INICIAIS
+    44497.83,    # BARILOCHE – IPTU / ITR
+    41592.66,    # ÁGATA – ASSESSORIA CONTÁBIL
+    32943.70,    # NORTHSIDE – CUSTO DA ÁREA (ROÇADA...)
+    31409.24,    # NORTHSIDE – SUPRESSÃO VEGETAL
+    28995.30,    # BARILOCHE – TAXAS E IMPOSTOS (ITBI...)
+    26232.79,    # BARILOCHE – PROJETOS DE EDIFICAÇÕES
+    23013.17,    # NORTHSIDE – PROJETOS DE EDIFICAÇÕES
+    18950.00,    # BARILOCHE – ASSESSORIA CONTÁBIL
+    18402.78,    # BARILOCHE – FORNECIMENTO DE MATERIAL
+    17980.00,    # BARILOCHE – LIMPEZA DE ÁREA E TERRAPLANAGEM
+    13544.74,    # NORTHSIDE – COFINS
+    13220.59,    # NORTHSIDE – REGISTRO DE IMÓVEIS
+    11164.96,    # NORTHSIDE – CSLL IRPJ
+    8212.40,     # BARILOCHE – DESPESAS INICIAIS
+    7390.28,     # ÁGATA – TAXAS BANCÁRIAS
+    7300.00,     # NORTHSIDE – SERVIÇOS DE TOPOGRAFIA
+    7100.00,     # NORTHSIDE – TRANSF. ENTRE CONTAS AGATA (SAIDA)
+    5000.00,     # NORTHSIDE – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
+    4472.22,     # ÁGATA – TAXAS E CONTRIBUIÇÕES
+    4200.00,     # NORTHSIDE – DESPESAS LEGAIS, CARTORIAIS...
+    3926.26,     # NORTHSIDE – TAXAS BANCÁRIAS
+    3503.73,     # BARILOCHE – DESPESAS LEGAIS, CARTORIAIS...
+    3484.40,     # BARILOCHE – LOCAÇÃO DE APOIO
+    3451.61,     # BARILOCHE – CONSUMO DE ÁGUA E ENERGIA
+    2934.69,     # NORTHSIDE – PIS
+    2842.35,     # NORTHSIDE – SEGURANÇA
+    2765.04,     # ÁGATA – OUTRAS DESPESAS
+    2600.86,     # NORTHSIDE – CONSUMO DE ÁGUA E ENERGIA
+    2096.62,     # BARILOCHE – SERVIÇOS DE TOPOGRAFIA
+    2042.78,     # NORTHSIDE – TAXAS E CONTRIBUIÇÕES
+    1977.76,     # ÁGATA – VIAGEM
+    1817.34,     # BARILOCHE – TRANSF. ENTRE CONTAS BARILOCHE (SAIDA)
+    1595.87,     # BARILOCHE – TAXAS BANCÁRIAS
+    1530.00,     # BARILOCHE – PROJETOS AMBIENTAIS
+    1500.00,     # BARILOCHE – ASSESSORIA TÉCNICA
+    1334.06,     # NORTHSIDE – PLACAS DE OBRAS, SINALIZAÇÃO
+    1260.36,     # BARILOCHE – TAXAS E CONTRIBUIÇÕES
+    1220.00,     # ÁGATA – BENS DE PEQUENO VALOR
+    975.69,      # ÁGATA – ASSINATURA DIGITAL, CERTIFICAÇÃO
+    550.00,      # NORTHSIDE – ASSESSORIA JURÍDICA
+    206.91,      # NORTHSIDE – ASSINATURA DIGITAL, CERTIFICAÇÃO
+    111.82,      # BARILOCHE – IMPOSTOS (ISSQN, IRRF...)
+], dtype=np.float64)
 
-total_entradas = sum(entradas)
-total_saidas = sum(saidas)
+total_entradas = entradas.sum()
+total_saidas = saidas.sum()
 saldo = total_entradas - total_saidas
 
 print("Total de Entradas:", BR(total_entradas))
@@ -112,7 +112,7 @@ def is_transfer(label: str) -> bool:
     return 'TRANSF.' in label or 'TRANSFER' in label
 
 # Mapas com rótulos para auditar
-rotulos_entradas = [
+rotulos_entradas = np.array([
     "ÁGATA APORTE CAP",
     "NORTHSIDE TRANSF AGATA ENTRADA",
     "NORTHSIDE RECEITAS VENDAS",
@@ -130,9 +130,9 @@ rotulos_entradas = [
     "BARILOCHE RECEITA APLICAÇÕES",
     "NORTHSIDE OUTRAS RECEITAS FIN",
     "BARILOCHE TAXAS BANCÁRIAS ENTRADA",
-]
+])
 
-rotulos_saidas = [
+rotulos_saidas = np.array([
     "ÁGATA TRANSF LIFECON SAIDA",
     "NORTHSIDE OBRAS INFRA",
     "NORTHSIDE OBRAS EDIF",
@@ -200,14 +200,14 @@ rotulos_saidas = [
     "NORTHSIDE ASSESSORIA JURÍDICA",
     "NORTHSIDE ASSINATURA DIGITAL",
     "BARILOCHE IMPOSTOS ISSQN",
-]
+])
 
 # Identificar transferências por rótulo simples (contendo "TRANSF")
-transfer_entradas = [v for r, v in zip(rotulos_entradas, entradas) if 'TRANSF' in r]
-transfer_saidas = [v for r, v in zip(rotulos_saidas, saidas) if 'TRANSF' in r]
+mask_transf_entradas = np.char.find(rotulos_entradas, 'TRANSF') >= 0
+mask_transf_saidas = np.char.find(rotulos_saidas, 'TRANSF') >= 0
 
-total_transf_entradas = sum(transfer_entradas)
-total_transf_saidas = sum(transfer_saidas)
+total_transf_entradas = entradas[mask_transf_entradas].sum()
+total_transf_saidas = saidas[mask_transf_saidas].sum()
 liquido_transf = total_transf_entradas - total_transf_saidas
 
 print("\nEfeito líquido das TRANSFERÊNCIAS (devem tender a zero no consolidado):")
@@ -216,8 +216,8 @@ print("Saídas   de transferências:", BR(total_transf_saidas))
 print("Líquido de transferências  :", BR(liquido_transf))
 
 # Saldo excluindo TODAS as transferências (para ver o caixa operacional consolidado)
-entradas_sem_transf = sum(v for r, v in zip(rotulos_entradas, entradas) if 'TRANSF' not in r)
-saidas_sem_transf = sum(v for r, v in zip(rotulos_saidas, saidas) if 'TRANSF' not in r)
+entradas_sem_transf = entradas[~mask_transf_entradas].sum()
+saidas_sem_transf = saidas[~mask_transf_saidas].sum()
 saldo_sem_transf = entradas_sem_transf - saidas_sem_transf
 
 print("\nTotais sem transferências:")
@@ -226,7 +226,7 @@ print("Saídas   (sem transf):", BR(saidas_sem_transf))
 print("Saldo    (sem transf):", BR(saldo_sem_transf))
 
 # Delta indicado pelo usuário que precisamos explicar
-saldo_desejado = Decimal('105541.58')
+saldo_desejado = 105541.58
 delta = saldo_desejado - saldo
 print("\nSaldo desejado:", BR(saldo_desejado))
 print("Delta (falta para bater):", BR(delta))
\ No newline at end of file
@@ -11,15 +11,16 @@ Arquitetura: Clean Architecture com Separation of Concerns
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 import os
 from pathlib import Path
-import plotly.graph_objects as go
-import io
+import html
 
 from src.data_processor import DataProcessor
 from src.visualizations import Visualizations
-from src.utils import formatar_moeda, formatar_percentual, criar_periodo_legivel
+from src.utils import formatar_moeda, formatar_moeda_vetorizado, formatar_percentual, criar_periodo_legivel, gerar_csv_bytes
 
 # Configuração da página
 st.set_page_config(
@@ -30,7 +31,10 @@ st.set_page_config(
 )
 
 # CSS customizado para melhorar a aparência COM ANIMAÇÕES E SUPORTE A TEMA ESCURO/CLARO
-st.markdown("""
+@st.cache_resource
+def css_customizado() -> str:
+    """Bloco <style> do dashboard, montado uma única vez por processo"""
+    return """
 <style>
     /* Header - Adaptável ao tema usando cores que funcionam bem em ambos */
     .main-header {
@@ -179,12 +183,87 @@ st.markdown("""
         }
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(css_customizado(), unsafe_allow_html=True)
+
+
+# Colunas do CSV usadas pelo dashboard (o arquivo já tem o prefixo "Content.")
+COLUNAS_CSV = [
+    'Content.Data',
+    'Content.Grupo',
+    'Content.Subgrupo',
+    'Content.Natureza',
+    'Content.FORNECEDOR',
+    'Content.Entrada (R$)',
+    'Content.Saída (R$)',
+    'Name'  # Conta bancária
+]
+
+# Colunas de texto repetitivo gravadas como categóricas no Parquet
+COLUNAS_CATEGORICAS = [
+    'Content.Grupo',
+    'Content.Subgrupo',
+    'Content.Natureza',
+    'Content.FORNECEDOR',
+    'Name'
+]
+
+
+def atualizar_cache_parquet(arquivo_csv: Path, arquivo_parquet: Path):
+    """
+    Regera o Parquet a partir do CSV quando ele não existe ou está desatualizado
+    
+    Args:
+        arquivo_csv: Caminho do CSV de origem
+        arquivo_parquet: Caminho do Parquet de cache
+    """
+    if arquivo_parquet.exists() and arquivo_csv.stat().st_mtime <= arquivo_parquet.stat().st_mtime:
+        return
+    
+    # Textos repetitivos já lidos como categóricas (códigos int8/int16 em vez de strings)
+    dtypes = {col: 'category' for col in COLUNAS_CATEGORICAS}
+    dtypes.update({'Content.Entrada (R$)': str, 'Content.Saída (R$)': str})
+    
+    df = pd.read_csv(
+        arquivo_csv,
+        sep=';',
+        encoding='utf-8',
+        usecols=COLUNAS_CSV,
+        dtype=dtypes
+    )
+    
+    df['Content.Data'] = pd.to_datetime(df['Content.Data'], format='%d/%m/%Y', errors='coerce')
+    
+    df.to_parquet(arquivo_parquet, engine='pyarrow', compression='zstd', index=False)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def criar_processor(arquivo_parquet: str, versao: float) -> DataProcessor:
+    """
+    Lê o Parquet e inicializa o DataProcessor, reaproveitado entre reruns
+    
+    Só o processor da versão atual fica em memória (max_entries=1): ao salvar
+    o CSV o anterior é descartado. Por isso as chaves de cache usam
+    processor.versao, e não id(processor), que o Python pode reaproveitar.
+    
+    Args:
+        arquivo_parquet: Caminho do Parquet de cache
+        versao: mtime do CSV (invalida o cache quando o arquivo muda)
+        
+    Returns:
+        DataProcessor: Processador de dados inicializado
+    """
+    df = pd.read_parquet(arquivo_parquet, engine='pyarrow', columns=COLUNAS_CSV)
+    processor = DataProcessor(df)
+    processor.versao = versao
+    return processor
 
 
 def carregar_dados():
     """
-    Carrega dados do arquivo CSV
+    Carrega dados do arquivo CSV (via cache Parquet)
     Cache para melhor performance
     
     Returns:
@@ -192,31 +271,17 @@ def carregar_dados():
     """
     # Caminho do arquivo CSV
     arquivo_csv = Path("Fluxo Financeiro.csv")
+    arquivo_parquet = arquivo_csv.with_suffix('.parquet')
     
     if not arquivo_csv.exists():
         return None
     
     try:
-        # Leitura do CSV com configurações específicas
-        # O arquivo já tem as colunas com prefixo "Content."
-        df = pd.read_csv(
-            arquivo_csv,
-            sep=';',
-            encoding='utf-8',
-            usecols=[
-                'Content.Data',
-                'Content.Grupo', 
-                'Content.Subgrupo',
-                'Content.Natureza',
-                'Content.FORNECEDOR',
-                'Content.Entrada (R$)',
-                'Content.Saída (R$)',
-                'Name'  # Conta bancária
-            ]
-        )
+        # Parse do CSV só na primeira carga ou quando o arquivo mudar
+        atualizar_cache_parquet(arquivo_csv, arquivo_parquet)
         
         # Inicializar processador (já com nomes corretos)
-        processor = DataProcessor(df)
+        processor = criar_processor(str(arquivo_parquet), arquivo_csv.stat().st_mtime)
         
         return processor
         
@@ -266,13 +331,293 @@ def renderizar_kpis(kpis: dict):
         )
 
 
-def renderizar_composicao_kpis(df: pd.DataFrame):
+def chave_filtros(filtros: dict, df: pd.DataFrame) -> tuple:
+    """
+    Impressão digital barata de um recorte filtrado, usada como chave de cache
+    
+    Args:
+        filtros: Filtros selecionados na sidebar
+        df: DataFrame resultante dos filtros
+        
+    Returns:
+        tuple: Período, seleções, número de linhas e saldo do recorte
+    """
+    return (
+        filtros['data_inicio'],
+        filtros['data_fim'],
+        tuple(filtros['grupos'] or ()),
+        tuple(filtros['fornecedores'] or ()),
+        tuple(filtros['naturezas'] or ()),
+        len(df),
+        round(float(df['Saldo'].sum()), 2)
+    )
+
+
+def obter_recortes(processor: DataProcessor, filtros: dict) -> dict:
+    """
+    Recortes filtrados (completo e operacional) reaproveitados entre reruns
+    
+    Cliques em abas, expanders e seletores internos reexecutam o script inteiro
+    sem mudar os filtros da sidebar; nesses casos os recortes e as chaves de
+    cache guardados em st.session_state são devolvidos sem refiltrar os dados.
+    
+    Args:
+        processor: Processador de dados
+        filtros: Filtros selecionados na sidebar
+        
+    Returns:
+        dict: 'completo', 'operacional', 'mask_interno', 'chave_completo'
+              e 'chave_operacional'
+    """
+    impressao = (
+        processor.versao,
+        filtros['data_inicio'],
+        filtros['data_fim'],
+        tuple(filtros['grupos'] or ()),
+        tuple(filtros['fornecedores'] or ()),
+        tuple(filtros['naturezas'] or ())
+    )
+    recortes = st.session_state.get('recortes_filtrados')
+    if recortes is not None and recortes['impressao'] == impressao:
+        return recortes
+    
+    # Aplicar filtros uma única vez na visão completa (para análises financeiras e contas)
+    df_completo = processor.obter_df_filtrado(
+        data_inicio=filtros['data_inicio'],
+        data_fim=filtros['data_fim'],
+        grupos=filtros['grupos'],
+        fornecedores=filtros['fornecedores'],
+        naturezas=filtros['naturezas']
+    )
+    
+    # Visão operacional (base para maioria das análises) derivada por máscara:
+    # remove as transações FINANCEIRO_INTERNO
+    mask_interno = (df_completo['TipoTransacao'] == 'FINANCEIRO_INTERNO').to_numpy()
+    df_operacional = df_completo[~mask_interno]
+    
+    recortes = {
+        'impressao': impressao,
+        'completo': df_completo,
+        'operacional': df_operacional,
+        'mask_interno': mask_interno,
+        'chave_completo': chave_filtros(filtros, df_completo),
+        'chave_operacional': chave_filtros(filtros, df_operacional)
+    }
+    st.session_state['recortes_filtrados'] = recortes
+    return recortes
+
+
+def somar_por_chaves(df: pd.DataFrame, chaves: list, colunas: list) -> pd.DataFrame:
+    """
+    Soma várias colunas por um conjunto de chaves numa única passada
+    
+    Cada chave vira um código ordenado (factorize) e os códigos são empacotados
+    num único int64; após uma ordenação estável, os grupos são faixas contínuas
+    e todas as colunas são somadas com np.add.reduceat, sem hashing de strings
+    por linha. O resultado sai ordenado pelas chaves (como o groupby padrão).
+    
+    Args:
+        df: DataFrame com as chaves e as colunas de valor
+        chaves: Colunas de agrupamento
+        colunas: Colunas numéricas a somar
+        
+    Returns:
+        DataFrame com as chaves e as somas de cada coluna
+    """
+    codigos, categorias = zip(*(pd.factorize(df[c], sort=True) for c in chaves))
+    
+    # Linhas com chave ausente ficam de fora (como no groupby padrão)
+    validas = np.logical_and.reduce([c >= 0 for c in codigos])
+    if not validas.any():
+        return pd.DataFrame({col: pd.Series(dtype=df[col].dtype) for col in chaves + colunas})
+    
+    chave_empacotada = np.zeros(int(validas.sum()), dtype=np.int64)
+    for codigo, categoria in zip(codigos, categorias):
+        chave_empacotada = chave_empacotada * len(categoria) + codigo[validas]
+    
+    ordem = np.argsort(chave_empacotada, kind='stable')
+    chaves_ordenadas = chave_empacotada[ordem]
+    inicios = np.concatenate(([0], np.flatnonzero(np.diff(chaves_ordenadas)) + 1))
+    
+    # Desempacota as chaves de cada faixa (da última para a primeira)
+    resultado = {}
+    restante = chaves_ordenadas[inicios]
+    for chave, categoria in reversed(list(zip(chaves, categorias))):
+        restante, codigo = np.divmod(restante, len(categoria))
+        resultado[chave] = np.asarray(categoria)[codigo]
+    resultado = {chave: resultado[chave] for chave in chaves}
+    
+    for col in colunas:
+        valores = df[col].to_numpy(dtype=np.float64)[validas][ordem]
+        resultado[col] = np.add.reduceat(valores, inicios)
+    
+    return pd.DataFrame(resultado)
+
+
+@st.cache_data(show_spinner=False)
+def compor_entradas(chave: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Entradas agregadas por Grupo → Subgrupo → Natureza (cacheado pela chave do recorte)
+    
+    Args:
+        chave: versão do CSV do processor + chave do recorte (ver chave_filtros)
+        _df: DataFrame filtrado (não entra no hash do cache)
+        
+    Returns:
+        DataFrame ordenado do maior para o menor valor
+    """
+    df_entradas = somar_por_chaves(_df[_df['Entrada'] > 0], ['Grupo', 'Subgrupo', 'Natureza'], ['Entrada'])
+    return df_entradas.sort_values('Entrada', ascending=False)
+
+
+@st.cache_data(show_spinner=False)
+def compor_saidas(chave: tuple, _df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Saídas agregadas por Grupo → Subgrupo → Natureza (cacheado pela chave do recorte)
+    
+    Args:
+        chave: versão do CSV do processor + chave do recorte (ver chave_filtros)
+        _df: DataFrame filtrado (não entra no hash do cache)
+        
+    Returns:
+        DataFrame ordenado do maior para o menor valor absoluto
+    """
+    df_saidas = somar_por_chaves(_df[_df['Saida'] < 0], ['Grupo', 'Subgrupo', 'Natureza'], ['Saida'])
+    df_saidas['Saida_Abs'] = df_saidas['Saida'].abs()
+    return df_saidas.sort_values('Saida_Abs', ascending=False)
+
+
+@st.cache_data(show_spinner=False)
+def agregar_natureza_subgrupo(chave: tuple, _df: pd.DataFrame) -> tuple:
+    """
+    Totais da aba Natureza por (Grupo, Subgrupo, Natureza) e por (Grupo, Subgrupo)
+    
+    Args:
+        chave: versão do CSV do processor + chave do recorte + grupo selecionado
+        _df: DataFrame da análise (não entra no hash do cache)
+        
+    Returns:
+        tuple: (detalhado por natureza, resumo por subgrupo), já ordenados
+    """
+    df_natureza_detalhado = somar_por_chaves(
+        _df, ['Grupo', 'Subgrupo', 'Natureza'], ['Entrada', 'Saida', 'Saldo']
+    )
+    df_natureza_detalhado['Saida_Abs'] = df_natureza_detalhado['Saida'].abs()
+    # Natureza desempata (mesma ordem do groupby ordenado)
+    df_natureza_detalhado = df_natureza_detalhado.sort_values(
+        ['Grupo', 'Subgrupo', 'Saida_Abs', 'Natureza'], ascending=[True, True, False, True]
+    )
+    
+    # Resumo por subgrupo derivado do detalhado (bem menor que o recorte)
+    df_subgrupo_resumo = somar_por_chaves(
+        df_natureza_detalhado, ['Grupo', 'Subgrupo'], ['Entrada', 'Saida', 'Saldo']
+    )
+    df_subgrupo_resumo['Saida_Abs'] = df_subgrupo_resumo['Saida'].abs()
+    df_subgrupo_resumo = df_subgrupo_resumo.sort_values(
+        ['Grupo', 'Saida_Abs', 'Subgrupo'], ascending=[True, False, True]
+    )
+    
+    return df_natureza_detalhado, df_subgrupo_resumo
+
+
+@st.cache_data(show_spinner=False)
+def indices_grupo_subgrupo(chave: tuple, _df: pd.DataFrame) -> dict:
+    """
+    Posições das despesas/receitas por (Grupo, Subgrupo), calculadas uma vez por recorte
+    
+    Args:
+        chave: versão do CSV do processor + chave do recorte (ver chave_filtros)
+        _df: DataFrame filtrado (não entra no hash do cache)
+        
+    Returns:
+        dict: Para 'despesas' e 'receitas': 'opcoes' (grupo -> subgrupos ordenados)
+              e 'indices' ((grupo, subgrupo) -> posições em _df)
+    """
+    resultado = {}
+    for sentido, mascara in (('despesas', _df['Saida'] < 0), ('receitas', _df['Entrada'] > 0)):
+        posicoes = np.flatnonzero(mascara.to_numpy())
+        grupos = _df.iloc[posicoes].groupby(['Grupo', 'Subgrupo'], observed=True, sort=False).indices
+        
+        # Posições relativas ao sub-recorte convertidas para posições em _df
+        indices = {chave_gs: posicoes[pos] for chave_gs, pos in grupos.items()}
+        opcoes = {}
+        for grupo, subgrupo in sorted(indices):
+            opcoes.setdefault(grupo, []).append(subgrupo)
+        
+        resultado[sentido] = {'opcoes': opcoes, 'indices': indices}
+    return resultado
+
+
+@st.cache_data(show_spinner=False)
+def calculo_cacheado(nome: str, chave: tuple, _calcular):
+    """
+    Executa um cálculo do DataProcessor só quando (nome, chave) muda
+    
+    Args:
+        nome: Identificador do cálculo
+        chave: versão do CSV do processor + chave do recorte (ver chave_filtros)
+        _calcular: Função sem argumentos que faz o cálculo (não entra no hash)
+        
+    Returns:
+        Resultado do cálculo (dict/DataFrame)
+    """
+    return _calcular()
+
+
+@st.cache_data(show_spinner=False)
+def figura_cacheada(nome: str, chave: tuple, _construir) -> dict:
+    """
+    Constrói a figura só quando (nome, chave) muda e devolve seu dict serializado
+    
+    Args:
+        nome: Identificador da figura
+        chave: versão do CSV do processor + chave dos dados que alimentam a figura
+        _construir: Função sem argumentos que cria a go.Figure (não entra no hash)
+        
+    Returns:
+        dict: Figura pronta para st.plotly_chart
+    """
+    return _construir().to_dict()
+
+
+def html_composicao(df_agregado: pd.DataFrame, coluna_valor: str, total: float) -> str:
+    """
+    Monta o HTML da lista de composição em uma única string
+    
+    Args:
+        df_agregado: Agregação por Grupo/Subgrupo/Natureza (já ordenada)
+        coluna_valor: Coluna com o valor (positivo) a exibir
+        total: Total de referência para o percentual
+        
+    Returns:
+        str: HTML com um bloco por combinação
+    """
+    valores = df_agregado[coluna_valor].to_numpy()
+    percentuais = valores / total * 100 if total > 0 else np.zeros(len(valores))
+    
+    linhas = [
+        f'<div style="margin-bottom: 0.75rem;"><b>{html.escape(str(g))}</b> → '
+        f'{html.escape(str(s))} → {html.escape(str(n)[:40])}<br>'
+        f'<code>{v}</code> ({p:.1f}%)</div>'
+        for g, s, n, v, p in zip(
+            df_agregado['Grupo'].to_numpy(),
+            df_agregado['Subgrupo'].to_numpy(),
+            df_agregado['Natureza'].to_numpy(),
+            formatar_moeda_vetorizado(valores),
+            percentuais
+        )
+    ]
+    return ''.join(linhas)
+
+
+def renderizar_composicao_kpis(df: pd.DataFrame, chave: tuple):
     """
     Renderiza composição detalhada dos KPIs
     Mostra de onde vêm os valores de entradas e saídas
     
     Args:
         df: DataFrame filtrado
+        chave: versão do CSV do processor + chave do recorte filtrado (cache das agregações)
     """
     with st.expander("🔍 Ver composição detalhada dos valores", expanded=False):
         col1, col2 = st.columns(2)
@@ -282,20 +627,18 @@ def renderizar_composicao_kpis(df: pd.DataFrame):
             st.markdown("### 💰 Composição das Entradas")
             
             # Agregar por Grupo → Subgrupo → Natureza (mostra TODAS, não só top 10)
-            df_entradas = df[df['Entrada'] > 0].groupby(['Grupo', 'Subgrupo', 'Natureza'])['Entrada'].sum().reset_index()
-            df_entradas = df_entradas.sort_values('Entrada', ascending=False)
+            df_entradas = compor_entradas(chave, df)
             
             total_entradas = df['Entrada'].sum()
             
             if len(df_entradas) > 0:
                 # Container com scroll para entradas
                 with st.container(height=500):
-                    for _, row in df_entradas.iterrows():
-                        percentual = (row['Entrada'] / total_entradas * 100) if total_entradas > 0 else 0
-                        st.markdown(
-                            f"**{row['Grupo']}** → {row['Subgrupo']} → {row['Natureza'][:40]}  \n"
-                            f"`{formatar_moeda(row['Entrada'])}` ({percentual:.1f}%)"
-                        )
+                    # Um único elemento markdown em vez de um por linha
+                    st.markdown(
+                        html_composicao(df_entradas, 'Entrada', total_entradas),
+                        unsafe_allow_html=True
+                    )
             else:
                 st.info("Nenhuma entrada no período filtrado")
         
@@ -304,21 +647,18 @@ def renderizar_composicao_kpis(df: pd.DataFrame):
             st.markdown("### 💸 Composição das Saídas")
             
             # Agregar por Grupo → Subgrupo → Natureza (mostra TODAS, não só top 10)
-            df_saidas = df[df['Saida'] < 0].groupby(['Grupo', 'Subgrupo', 'Natureza'])['Saida'].sum().reset_index()
-            df_saidas['Saida_Abs'] = df_saidas['Saida'].abs()
-            df_saidas = df_saidas.sort_values('Saida_Abs', ascending=False)
+            df_saidas = compor_saidas(chave, df)
             
             total_saidas = abs(df['Saida'].sum())
             
             if len(df_saidas) > 0:
                 # Container com scroll para saídas
                 with st.container(height=500):
-                    for _, row in df_saidas.iterrows():
-                        percentual = (row['Saida_Abs'] / total_saidas * 100) if total_saidas > 0 else 0
-                        st.markdown(
-                            f"**{row['Grupo']}** → {row['Subgrupo']} → {row['Natureza'][:40]}  \n"
-                            f"`{formatar_moeda(row['Saida_Abs'])}` ({percentual:.1f}%)"
-                        )
+                    # Um único elemento markdown em vez de um por linha
+                    st.markdown(
+                        html_composicao(df_saidas, 'Saida_Abs', total_saidas),
+                        unsafe_allow_html=True
+                    )
             else:
                 st.info("Nenhuma saída no período filtrado")
 
@@ -352,40 +692,498 @@ def renderizar_filtros(processor: DataProcessor):
         max_value=data_max
     )
     
-    # Grupos
-    st.sidebar.subheader("🏢 Grupos/Projetos")
-    grupos_disponiveis = processor.obter_valores_unicos('Grupo')
-    grupos_selecionados = st.sidebar.multiselect(
-        "Selecione grupos",
-        options=grupos_disponiveis,
-        default=[]
-    )
+    # Grupos
+    st.sidebar.subheader("🏢 Grupos/Projetos")
+    grupos_disponiveis = processor.obter_valores_unicos('Grupo')
+    grupos_selecionados = st.sidebar.multiselect(
+        "Selecione grupos",
+        options=grupos_disponiveis,
+        default=[]
+    )
+    
+    # Fornecedores
+    st.sidebar.subheader("🏪 Fornecedores")
+    fornecedores_disponiveis = processor.obter_valores_unicos('FORNECEDOR')
+    fornecedores_selecionados = st.sidebar.multiselect(
+        "Selecione fornecedores",
+        options=fornecedores_disponiveis,
+        default=[]
+    )
+    
+    # Naturezas
+    st.sidebar.subheader("📑 Naturezas")
+    naturezas_disponiveis = processor.obter_valores_unicos('Natureza')
+    naturezas_selecionadas = st.sidebar.multiselect(
+        "Selecione naturezas",
+        options=naturezas_disponiveis,
+        default=[]
+    )
+    
+    return {
+        'data_inicio': data_inicio,
+        'data_fim': data_fim,
+        'grupos': grupos_selecionados if grupos_selecionados else None,
+        'fornecedores': fornecedores_selecionados if fornecedores_selecionados else None,
+        'naturezas': naturezas_selecionadas if naturezas_selecionadas else None
+    }
+
+
+@st.fragment
+def renderizar_analise_financeira(processor: DataProcessor):
+    """
+    Aba Análise Financeira (aportes SCP e subgrupo FINANCEIRO)
+    
+    Executada como fragmento: mudar a taxa de juros ou a opção BARILOCHE
+    reexecuta só esta aba, não o dashboard inteiro.
+    
+    Args:
+        processor: Processador de dados
+    """
+    st.success("🔍 **Visão Completa** - Inclui todas as movimentações financeiras para análise de aportes e auditoria")
+    st.subheader("💰 Análise Financeira - Aportes SCP")
+    
+    # Configuração da taxa de juros e opção BARILOCHE
+    col_info1, col_config1, col_config2 = st.columns([2, 1, 1])
+    
+    with col_info1:
+        st.info("📊 Esta seção analisa os **Aportes de Capital SCP** e calcula o valor corrigido por juros compostos.")
+    
+    with col_config1:
+        taxa_juros = st.number_input(
+            "Taxa mensal (%)",
+            min_value=0.0,
+            max_value=10.0,
+            value=0.9477,
+            step=0.0001,
+            format="%.4f"
+        )
+    
+    with col_config2:
+        considerar_bariloche = st.checkbox(
+            "🏔️ BARILOCHE como pagamento",
+            value=True,
+            help="Considera gastos com BARILOCHE como amortizações dos aportes, reduzindo a base de cálculo dos juros"
+        )
+    
+    # Calcular aportes corrigidos (a correção vai até hoje: a data entra na chave)
+    chave_aportes = (processor.versao, taxa_juros, considerar_bariloche, datetime.now().date())
+    analise_aportes = calculo_cacheado(
+        'aportes_corrigidos',
+        chave_aportes,
+        lambda: processor.calcular_aportes_corrigidos(
+            taxa_juros_mensal=taxa_juros,
+            considerar_bariloche_como_pagamento=considerar_bariloche
+        )
+    )
+    
+    if analise_aportes['total_aportes_original'] > 0:
+        # KPIs de Aportes
+        st.markdown("### 📊 Resumo de Aportes SCP")
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "💵 Total Original",
+                formatar_moeda(analise_aportes['total_aportes_original'])
+            )
+        
+        with col2:
+            st.metric(
+                "📈 Total Corrigido",
+                formatar_moeda(analise_aportes['total_corrigido'])
+            )
+        
+        with col3:
+            percentual_juros = (analise_aportes['total_juros'] / analise_aportes['total_aportes_original']) * 100
+            st.metric(
+                "💸 Juros Acumulados",
+                formatar_moeda(analise_aportes['total_juros']),
+                delta=f"+{percentual_juros:.1f}%"
+            )
+        
+        with col4:
+            st.metric(
+                "📅 Data Base",
+                analise_aportes['data_base_calculo'].strftime('%d/%m/%Y')
+            )
+        
+        st.markdown("---")
+        
+        # Mostrar amortizações BARILOCHE se opção ativada
+        amortizacoes = analise_aportes['amortizacoes_bariloche']
+        if considerar_bariloche and len(amortizacoes['valor']) > 0:
+            st.info(
+                f"🏔️ **Modo BARILOCHE ativado:** {len(amortizacoes['valor'])} "
+                f"amortizações sendo consideradas como pagamentos dos aportes"
+            )
+            
+            with st.expander("📋 Ver detalhes das amortizações BARILOCHE"):
+                total_amortizado = amortizacoes['valor'].sum()
+                st.metric("💰 Total Amortizado (BARILOCHE)", formatar_moeda(total_amortizado))
+                
+                # Tabela de amortizações
+                df_amort = pd.DataFrame(amortizacoes)
+                # 'data' já chega como datetime64 do processor
+                df_amort['Data_Display'] = df_amort['data'].dt.strftime('%d/%m/%Y')
+                df_amort['Valor_Display'] = formatar_moeda_vetorizado(df_amort['valor'].to_numpy())
+                
+                st.dataframe(
+                    df_amort[['Data_Display', 'Valor_Display', 'natureza', 'fornecedor']].rename(columns={
+                        'Data_Display': 'Data',
+                        'Valor_Display': 'Valor',
+                        'natureza': 'Natureza',
+                        'fornecedor': 'Fornecedor'
+                    }),
+                    hide_index=True,
+                    use_container_width=True,
+                    height=min(300, len(df_amort) * 35 + 50)
+                )
+            
+            st.markdown("---")
+        
+        # MEMORIAL DE CÁLCULO
+        st.markdown("### 📋 Memorial de Cálculo")
+        st.info("🔍 **Auditoria Completa:** Este memorial mostra exatamente como os juros foram calculados, similar a uma planilha Excel auditável.")
+        
+        with st.expander("📊 Ver Memorial de Cálculo Detalhado", expanded=False):
+            if len(analise_aportes.get('memorial_calculo', [])) > 0:
+                # Converter memorial para DataFrame
+                df_memorial = pd.DataFrame(analise_aportes['memorial_calculo'])
+                
+                # Formatação para exibição
+                df_memorial['Valor_Original_Display'] = formatar_moeda_vetorizado(df_memorial['valor_original'].to_numpy())
+                df_memorial['Valor_Corrigido_Display'] = formatar_moeda_vetorizado(df_memorial['valor_corrigido'].to_numpy())
+                df_memorial['Juros_Display'] = formatar_moeda_vetorizado(df_memorial['juros_acumulados'].to_numpy())
+                df_memorial['Fator_Juros_Display'] = df_memorial['fator_juros'].map('{:.8f}'.format)
+                
+                # Colunas para exibição
+                colunas_exibir = [
+                    'data_aporte', 'Valor_Original_Display', 'meses_decorridos', 
+                    'taxa_mensal', 'Fator_Juros_Display', 'Valor_Corrigido_Display', 
+                    'Juros_Display', 'formula'
+                ]
+                
+                # Renomear colunas para exibição
+                df_display = df_memorial[colunas_exibir].copy()
+                df_display.columns = [
+                    'Data', 'Valor Original', 'Meses', 'Taxa (%)', 
+                    'Fator Juros', 'Valor Corrigido', 'Juros', 'Fórmula'
+                ]
+                
+                st.dataframe(
+                    df_display,
+                    hide_index=True,
+                    use_container_width=True,
+                    height=min(400, len(df_memorial) * 35 + 50)
+                )
+                
+                # Resumo do memorial
+                st.markdown("#### 📈 Resumo do Memorial:")
+                col_res1, col_res2, col_res3 = st.columns(3)
+                
+                with col_res1:
+                    st.metric(
+                        "📅 Total de Etapas",
+                        len(df_memorial)
+                    )
+                
+                with col_res2:
+                    st.metric(
+                        "💰 Valor Final",
+                        formatar_moeda(analise_aportes['total_corrigido'])
+                    )
+                
+                with col_res3:
+                    st.metric(
+                        "📊 Taxa Aplicada",
+                        f"{analise_aportes['taxa_juros']:.4f}% a.m."
+                    )
+                
+                # Opção para download do memorial
+                st.markdown("#### 💾 Exportar Memorial:")
+                if st.button("📥 Baixar Memorial de Cálculo (Excel)"):
+                    # Planilha gerada uma vez por memorial (mesma chave dos aportes);
+                    # cliques seguintes reaproveitam os bytes já compactados
+                    def gerar_memorial_excel():
+                        # Criar arquivo Excel com memorial
+                        import io
+                        output = io.BytesIO()
+                        
+                        # XlsxWriter em modo constant_memory grava linha a linha; sem ele, openpyxl
+                        try:
+                            import xlsxwriter  # noqa: F401
+                            engine, engine_kwargs = 'xlsxwriter', {'options': {'constant_memory': True}}
+                        except ImportError:
+                            engine, engine_kwargs = 'openpyxl', {}
+                        
+                        # Valores seguem numéricos na planilha (o Excel aplica o formato de moeda)
+                        df_excel = df_memorial.drop(columns=[c for c in df_memorial.columns if c.endswith('_Display')])
+                        colunas_moeda = ['valor_original', 'valor_corrigido', 'juros_acumulados', 'capital_antes', 'capital_depois']
+                        
+                        with pd.ExcelWriter(output, engine=engine, engine_kwargs=engine_kwargs) as writer:
+                            # Memorial detalhado
+                            df_excel.to_excel(writer, sheet_name='Memorial_Calculo', index=False)
+                            
+                            if engine == 'xlsxwriter':
+                                formato_moeda = writer.book.add_format({'num_format': '"R$" #,##0.00'})
+                                planilha = writer.sheets['Memorial_Calculo']
+                                for posicao, coluna in enumerate(df_excel.columns):
+                                    if coluna in colunas_moeda:
+                                        planilha.set_column(posicao, posicao, 18, formato_moeda)
+                            
+                            # Resumo
+                            resumo_data = {
+                                'Métrica': ['Total Aportes Original', 'Total Corrigido', 'Total Juros', 'Taxa Mensal (%)', 'Data Base'],
+                                'Valor': [
+                                    analise_aportes['total_aportes_original'],
+                                    analise_aportes['total_corrigido'],
+                                    analise_aportes['total_juros'],
+                                    analise_aportes['taxa_juros'],
+                                    analise_aportes['data_base_calculo'].strftime('%d/%m/%Y')
+                                ]
+                            }
+                            pd.DataFrame(resumo_data).to_excel(writer, sheet_name='Resumo', index=False)
+                        
+                        return output.getvalue()
+                    
+                    memorial_excel = calculo_cacheado('memorial_excel', chave_aportes, gerar_memorial_excel)
+                    
+                    st.download_button(
+                        label="📥 Download Memorial de Cálculo.xlsx",
+                        data=memorial_excel,
+                        file_name=f"Memorial_Calculo_Aportes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+            else:
+                st.warning("⚠️ Nenhum memorial de cálculo disponível.")
+        
+        # Alerta destacado
+        st.error(f"🚨 **DÍVIDA TOTAL CORRIGIDA:** {formatar_moeda(analise_aportes['total_corrigido'])} "
+                f"(Taxa: {taxa_juros}% a.m.)")
+        
+        st.markdown("---")
+        
+        # Gráficos - Layout organizado e simétrico
+        st.markdown("### 📈 Visualizações Gráficas")
+        
+        # Linha 1: Evolução Acumulativa (destaque - largura total)
+        st.markdown("#### 📊 Evolução Acumulativa do Capital + Juros")
+        fig_acumulativo = figura_cacheada(
+            'aportes_acumulativo',
+            chave_aportes,
+            lambda: Visualizations.criar_grafico_aportes_acumulativo(analise_aportes['aportes_detalhados'])
+        )
+        st.plotly_chart(fig_acumulativo, use_container_width=True)
+        
+        st.markdown("---")
+        
+        # Linha 2: Dois gráficos lado a lado (simétrico)
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown("#### 📊 Evolução Individual dos Aportes")
+            fig_aportes = figura_cacheada(
+                'aportes_corrigidos',
+                chave_aportes,
+                lambda: Visualizations.criar_grafico_aportes_corrigidos(analise_aportes['aportes_detalhados'])
+            )
+            st.plotly_chart(fig_aportes, use_container_width=True)
+        
+        with col2:
+            st.markdown("#### 💸 Juros por Aporte (Top 15)")
+            fig_juros = figura_cacheada(
+                'juros_acumulados',
+                chave_aportes,
+                lambda: Visualizations.criar_grafico_juros_acumulados(analise_aportes['aportes_detalhados'])
+            )
+            st.plotly_chart(fig_juros, use_container_width=True)
+        
+        # Tabela detalhada de aportes
+        st.markdown("---")
+        st.markdown("### 📋 Detalhamento dos Aportes")
+        
+        df_aportes_display = analise_aportes['aportes_detalhados'].copy()
+        df_aportes_display['Data_Display'] = df_aportes_display['Data'].dt.strftime('%d/%m/%Y')
+        df_aportes_display['Original'] = formatar_moeda_vetorizado(df_aportes_display['Entrada'].to_numpy())
+        df_aportes_display['Corrigido'] = formatar_moeda_vetorizado(df_aportes_display['Valor_Corrigido'].to_numpy())
+        df_aportes_display['Juros'] = formatar_moeda_vetorizado(df_aportes_display['Juros_Acumulados'].to_numpy())
+        df_aportes_display['Meses'] = df_aportes_display['Meses_Decorridos'].map('{:.1f}'.format)
+        
+        st.dataframe(
+            df_aportes_display[['Data_Display', 'Grupo', 'Natureza', 'Original', 
+                               'Meses', 'Juros', 'Corrigido']].rename(columns={
+                'Data_Display': 'Data',
+                'Original': 'Valor Original',
+                'Corrigido': 'Valor Corrigido',
+                'Meses': 'Meses Decorridos'
+            }),
+            hide_index=True,
+            use_container_width=True,
+            height=400
+        )
+    else:
+        st.warning("⚠️ Nenhum aporte SCP encontrado nos dados.")
+    
+    # Análise do Subgrupo Financeiro
+    st.markdown("---")
+    st.markdown("### 💼 Análise do Subgrupo FINANCEIRO")
+    
+    chave_fin = (processor.versao,)
+    analise_fin = calculo_cacheado(
+        'subgrupo_financeiro',
+        chave_fin,
+        processor.analise_subgrupo_financeiro
+    )
+    
+    if analise_fin['num_transacoes'] > 0:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            st.metric(
+                "📥 Entradas Financeiras",
+                formatar_moeda(analise_fin['total_entradas'])
+            )
+        
+        with col2:
+            st.metric(
+                "📤 Saídas Financeiras",
+                formatar_moeda(analise_fin['total_saidas'])
+            )
+        
+        with col3:
+            st.metric(
+                "💰 Saldo Financeiro",
+                formatar_moeda(analise_fin['saldo'])
+            )
+        
+        with col4:
+            st.metric(
+                "📊 Transações",
+                f"{analise_fin['num_transacoes']:,}".replace(',', '.')
+            )
+        
+        st.markdown("---")
+        
+        # Gráfico de distribuição por natureza
+        fig_fin = figura_cacheada(
+            'financeiro_natureza',
+            chave_fin,
+            lambda: Visualizations.criar_grafico_financeiro_natureza(analise_fin['df_financeiro'])
+        )
+        st.plotly_chart(fig_fin, use_container_width=True)
+        
+        # Tabela por natureza
+        st.markdown("### 📊 Resumo por Natureza")
+        df_nat_display = analise_fin['por_natureza'].copy()
+        df_nat_display['Entradas'] = formatar_moeda_vetorizado(df_nat_display['Entrada'].to_numpy())
+        df_nat_display['Saídas'] = formatar_moeda_vetorizado(np.abs(df_nat_display['Saida'].to_numpy()))
+        df_nat_display['Saldo'] = formatar_moeda_vetorizado(df_nat_display['Saldo'].to_numpy())
+        
+        st.dataframe(
+            df_nat_display[['Natureza', 'Entradas', 'Saídas', 'Saldo']],
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("ℹ️ Nenhuma transação financeira encontrada no período filtrado.")
+
+
+@st.fragment
+def renderizar_dados_detalhados(df_operacional_filtrado: pd.DataFrame,
+                                df_completo_filtrado: pd.DataFrame,
+                                chave_recortes: tuple):
+    """
+    Aba Dados Detalhados (busca, paginação e exportação)
+    
+    Executada como fragmento: digitar na busca ou trocar a visão/linhas por
+    página reexecuta só esta aba, não o dashboard inteiro.
+    
+    Args:
+        df_operacional_filtrado: Recorte sem transferências internas
+        df_completo_filtrado: Recorte com todas as movimentações
+        chave_recortes: Chaves de cache dos dois recortes (versão do CSV do processor + chave_filtros)
+    """
+    st.subheader("Dados Detalhados")
     
-    # Fornecedores
-    st.sidebar.subheader("🏪 Fornecedores")
-    fornecedores_disponiveis = processor.obter_valores_unicos('FORNECEDOR')
-    fornecedores_selecionados = st.sidebar.multiselect(
-        "Selecione fornecedores",
-        options=fornecedores_disponiveis,
-        default=[]
-    )
+    # Seletor de visão
+    col_visao, col_busca, col_linhas = st.columns([1, 2, 1])
     
-    # Naturezas
-    st.sidebar.subheader("📑 Naturezas")
-    naturezas_disponiveis = processor.obter_valores_unicos('Natureza')
-    naturezas_selecionadas = st.sidebar.multiselect(
-        "Selecione naturezas",
-        options=naturezas_disponiveis,
-        default=[]
+    with col_visao:
+        tipo_visao = st.radio(
+            "Visão dos Dados",
+            ["Operacional", "Completa"],
+            index=0,
+            help="Operacional: sem transferências internas | Completa: todas as transações"
+        )
+    
+    with col_busca:
+        busca = st.text_input("🔍 Buscar (fornecedor, natureza, grupo...)", "")
+    
+    with col_linhas:
+        num_linhas = st.selectbox("Linhas/página", [50, 100, 200, 500], index=1)
+    
+    # Selecionar DataFrame baseado na visão escolhida
+    df_display = df_operacional_filtrado if tipo_visao == "Operacional" else df_completo_filtrado
+    
+    # Indicador visual da visão ativa
+    if tipo_visao == "Operacional":
+        st.info("🎯 Exibindo **Visão Operacional** - Transferências internas excluídas")
+    else:
+        st.success("🔍 Exibindo **Visão Completa** - Todas as movimentações incluídas")
+    if busca:
+        # Uma única varredura sobre o texto de busca pré-calculado no processor
+        mask = df_display['TextoBusca'].str.contains(busca.lower(), regex=False, na=False)
+        df_display = df_display[mask]
+    
+    # Preparar para exibição (colunas formatadas criadas só nas linhas mostradas)
+    def com_colunas_exibicao(df_base):
+        df_base = df_base.copy()
+        df_base['Data_Display'] = df_base['Data'].dt.strftime('%d/%m/%Y')
+        df_base['Entrada_Display'] = formatar_moeda_vetorizado(df_base['Entrada'].to_numpy())
+        df_base['Saida_Display'] = formatar_moeda_vetorizado(np.abs(df_base['Saida'].to_numpy()))
+        df_base['Saldo_Display'] = formatar_moeda_vetorizado(df_base['Saldo'].to_numpy())
+        return df_base
+    
+    # Tabela da tela montada direto em Arrow (o st.dataframe não reconverte
+    # o pandas nem re-hasheia as strings formatadas)
+    df_top = df_display.head(num_linhas)
+    tabela_top = pa.table({
+        'Data_Display': pa.array(df_top['Data'].dt.strftime('%d/%m/%Y')),
+        **{col: pa.array(df_top[col]) for col in ['Grupo', 'Subgrupo', 'Natureza', 'FORNECEDOR']},
+        'Entrada_Display': pa.array(formatar_moeda_vetorizado(df_top['Entrada'].to_numpy()), type=pa.string()),
+        'Saida_Display': pa.array(formatar_moeda_vetorizado(np.abs(df_top['Saida'].to_numpy())), type=pa.string()),
+        'Saldo_Display': pa.array(formatar_moeda_vetorizado(df_top['Saldo'].to_numpy()), type=pa.string())
+    })
+    
+    st.dataframe(
+        tabela_top,
+        hide_index=True,
+        use_container_width=True,
+        height=600
     )
     
-    return {
-        'data_inicio': data_inicio,
-        'data_fim': data_fim,
-        'grupos': grupos_selecionados if grupos_selecionados else None,
-        'fornecedores': fornecedores_selecionados if fornecedores_selecionados else None,
-        'naturezas': naturezas_selecionadas if naturezas_selecionadas else None
-    }
+    # Botão de download
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 1, 2])
+    
+    with col1:
+        chave_csv = chave_recortes + (tipo_visao, busca)
+        csv = calculo_cacheado(
+            'csv_dados',
+            chave_csv,
+            # Formatação do recorte inteiro só quando o CSV precisa ser gerado
+            lambda: gerar_csv_bytes(com_colunas_exibicao(df_display.drop(columns='TextoBusca')))
+        )
+        st.download_button(
+            label="📥 Baixar CSV",
+            data=csv,
+            file_name=f"dados_financeiros_{tipo_visao.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
+            mime="text/csv"
+        )
+    
+    with col2:
+        # Estatísticas rápidas
+        st.metric("Total de Registros", f"{len(df_display):,}".replace(',', '.'))
 
 
 def main():
@@ -420,28 +1218,11 @@ def main():
     #   (inclui todas as transações para controle de caixa e auditoria)
     # ==============================================================================
     
-    # Aplicar filtros na visão operacional (base para maioria das análises)
-    df_operacional_filtrado = processor.obter_df_filtrado(
-        data_inicio=filtros['data_inicio'],
-        data_fim=filtros['data_fim'],
-        grupos=filtros['grupos'],
-        fornecedores=filtros['fornecedores'],
-        naturezas=filtros['naturezas']
-    )
-    
-    # Remover transações FINANCEIRO_INTERNO da visão operacional
-    df_operacional_filtrado = df_operacional_filtrado[
-        df_operacional_filtrado['TipoTransacao'] != 'FINANCEIRO_INTERNO'
-    ].copy()
-    
-    # Aplicar filtros na visão completa (para análises financeiras e contas)
-    df_completo_filtrado = processor.obter_df_filtrado(
-        data_inicio=filtros['data_inicio'],
-        data_fim=filtros['data_fim'],
-        grupos=filtros['grupos'],
-        fornecedores=filtros['fornecedores'],
-        naturezas=filtros['naturezas']
-    )
+    # Recortes completo/operacional (refiltrados só quando os filtros mudam)
+    recortes = obter_recortes(processor, filtros)
+    df_completo_filtrado = recortes['completo']
+    df_operacional_filtrado = recortes['operacional']
+    mask_interno = recortes['mask_interno']
     
     # Indicador visual inteligente na sidebar
     st.sidebar.markdown("---")
@@ -456,7 +1237,7 @@ def main():
     
     # Estatísticas das visões
     total_transacoes = len(df_completo_filtrado)
-    transacoes_internas = len(df_completo_filtrado[df_completo_filtrado['TipoTransacao'] == 'FINANCEIRO_INTERNO'])
+    transacoes_internas = int(mask_interno.sum())
     transacoes_operacionais = len(df_operacional_filtrado)
     
     st.sidebar.markdown(f"""
@@ -471,15 +1252,22 @@ def main():
         st.warning("⚠️ Nenhum dado encontrado para os filtros selecionados.")
         return
     
+    # Chaves dos cálculos do processor (troca de aba/expander não recalcula)
+    chave_proc_operacional = (processor.versao,) + recortes['chave_operacional']
+    chave_proc_completo = (processor.versao,) + recortes['chave_completo']
+    
     # ============================================================================
     # KPIs PRINCIPAIS - SEMPRE VISÍVEIS NO TOPO
     # ============================================================================
     
     # Informação do período (usando visão operacional como padrão)
-    periodo_info = criar_periodo_legivel(
-        df_operacional_filtrado['Data'].min(),
-        df_operacional_filtrado['Data'].max()
-    )
+    # Dados já ordenados por Data no processor (o filtro preserva a ordem)
+    datas_operacionais = df_operacional_filtrado['Data']
+    if len(datas_operacionais) > 0:
+        data_min, data_max = datas_operacionais.iloc[0], datas_operacionais.iloc[-1]
+    else:
+        data_min = data_max = pd.NaT
+    periodo_info = criar_periodo_legivel(data_min, data_max)
     st.info(f"📅 Período analisado: **{periodo_info}** | 📊 {len(df_operacional_filtrado):,} transações operacionais".replace(',', '.'))
     
     # KPIs principais fixos no topo - APENAS SE HOUVER FILTRO DE GRUPOS ATIVO
@@ -487,7 +1275,11 @@ def main():
     
     if tem_filtro_grupos:
         st.markdown("---")
-        kpis = processor.calcular_kpis(df_operacional_filtrado)
+        kpis = calculo_cacheado(
+            'kpis',
+            chave_proc_operacional,
+            lambda: processor.calcular_kpis(df_operacional_filtrado)
+        )
         
         # Criar container com background destacado para os KPIs
         with st.container():
@@ -495,7 +1287,7 @@ def main():
             renderizar_kpis(kpis)
             
             # Composição detalhada dos KPIs (visão operacional)
-            renderizar_composicao_kpis(df_operacional_filtrado)
+            renderizar_composicao_kpis(df_operacional_filtrado, chave_proc_operacional)
         
         st.markdown("---")
     
@@ -520,7 +1312,11 @@ def main():
         st.subheader("💳 Saldo por Conta Bancária")
         
         # Calcular saldos por conta (usando visão completa com todas as transações)
-        saldos_contas = processor.calcular_saldos_por_conta(df_completo_filtrado)
+        saldos_contas = calculo_cacheado(
+            'saldos_por_conta',
+            chave_proc_completo,
+            lambda: processor.calcular_saldos_por_conta(df_completo_filtrado)
+        )
         
         if saldos_contas:
             # KPIs de Contas Consolidadas
@@ -562,26 +1358,23 @@ def main():
             
             por_conta = saldos_contas['por_conta']
             
-            # Criar DataFrame para exibição
-            dados_contas = []
-            for conta, info in por_conta.items():
-                # Remover prefixo "Fluxo" e formatar nome
-                nome_conta = conta.replace('Fluxo', '')
-                dados_contas.append({
-                    'Conta': nome_conta,
-                    'Saldo': info['saldo'],
-                    'Entradas': info['entradas'],
-                    'Saídas': info['saidas'],
-                    'Transações': info['transacoes']
-                })
+            # Criar DataFrame para exibição (construção colunar direto do dict por conta)
+            df_contas = pd.DataFrame.from_dict(por_conta, orient='index').rename(columns={
+                'saldo': 'Saldo',
+                'entradas': 'Entradas',
+                'saidas': 'Saídas',
+                'transacoes': 'Transações'
+            })
             
-            df_contas = pd.DataFrame(dados_contas).sort_values('Saldo', ascending=False)
+            # Remover prefixo "Fluxo" e formatar nome
+            df_contas.index = df_contas.index.str.replace('Fluxo', '', regex=False)
+            df_contas = df_contas.reset_index(names='Conta').sort_values('Saldo', ascending=False)
             
-            # Formatar para exibição
+            # Formatar para exibição no padrão BR ("R$ 1.234,56"): o NumberColumn do
+            # Streamlit não tem separadores brasileiros; são poucas linhas por conta
             df_contas_display = df_contas.copy()
-            df_contas_display['Saldo'] = df_contas_display['Saldo'].apply(formatar_moeda)
-            df_contas_display['Entradas'] = df_contas_display['Entradas'].apply(formatar_moeda)
-            df_contas_display['Saídas'] = df_contas_display['Saídas'].apply(formatar_moeda)
+            for col in ['Saldo', 'Entradas', 'Saídas']:
+                df_contas_display[col] = formatar_moeda_vetorizado(df_contas[col].to_numpy())
             
             st.dataframe(
                 df_contas_display,
@@ -594,8 +1387,6 @@ def main():
             st.markdown("---")
             st.markdown("### 📊 Comparativo de Saldos")
             
-            fig_contas = go.Figure()
-            
             # Cores personalizadas
             cores = {
                 'Lifecon5': '#3B82F6',
@@ -603,30 +1394,41 @@ def main():
                 'Agata': '#8B5CF6',
                 'Bariloche': '#EC4899'
             }
+            cores_contas = [cores.get(conta, '#6B7280') for conta in df_contas['Conta']]
             
-            for _, row in df_contas.iterrows():
-                cor = cores.get(row['Conta'], '#6B7280')
-                fig_contas.add_trace(
+            def construir_fig_contas():
+                # Import tardio: Plotly só é carregado quando a figura precisa ser construída
+                import plotly.graph_objects as go
+                
+                # Um único trace com arrays (uma barra por conta, cor por barra)
+                fig = go.Figure(
                     go.Bar(
-                        name=row['Conta'],
-                        x=[row['Conta']],
-                        y=[row['Saldo']],
-                        text=[formatar_moeda(row['Saldo'])],
+                        x=df_contas['Conta'],
+                        y=df_contas['Saldo'],
+                        text=formatar_moeda_vetorizado(df_contas['Saldo'].to_numpy()),
                         textposition='outside',
-                        marker=dict(color=cor, opacity=0.85, cornerradius=8),
+                        marker=dict(color=cores_contas, opacity=0.85, cornerradius=8),
                         hovertemplate='<b>%{x}</b><br>Saldo: %{text}<extra></extra>'
                     )
                 )
 
-            fig_contas.update_layout(
-                title='Saldo em Cada Conta Bancária',
-                template='plotly_dark',
-                height=600,
-                width=800,
-                showlegend=False,
-                xaxis_title='Conta',
-                yaxis_title='Saldo (R$)',
-                bargap=0.3  # Espaçamento entre barras para deixá-las mais esbeltas
+                fig.update_layout(
+                    title='Saldo em Cada Conta Bancária',
+                    template='plotly_dark',
+                    height=600,
+                    width=800,
+                    showlegend=False,
+                    xaxis_title='Conta',
+                    yaxis_title='Saldo (R$)',
+                    bargap=0.3  # Espaçamento entre barras para deixá-las mais esbeltas
+                )
+                return fig
+
+            # Figura reaproveitada enquanto o recorte (e o processor) não mudar
+            fig_contas = figura_cacheada(
+                'contas',
+                chave_proc_completo,
+                construir_fig_contas
             )
             
             # Centralizar o gráfico com largura controlada
@@ -646,12 +1448,21 @@ def main():
         ].copy()
         st.info("🎯 **Visão Operacional** — NORTHSIDE / RITHMO | Análise sem transferências internas")
         st.subheader("Evolução Temporal do Fluxo de Caixa")
-        df_temporal = processor.agregacao_temporal(df_evolucao_rithmo, freq='ME')
-        fig_temporal = Visualizations.criar_grafico_evolucao_temporal(df_temporal)
+        fig_temporal = figura_cacheada(
+            'temporal',
+            chave_proc_operacional,
+            lambda: Visualizations.criar_grafico_evolucao_temporal(
+                processor.agregacao_temporal(df_evolucao_rithmo, freq='ME')
+            )
+        )
         st.plotly_chart(fig_temporal, use_container_width=True)
         
         st.subheader("Comparativo Mensal")
-        fig_comparativo = Visualizations.criar_grafico_comparativo_mensal(df_evolucao_rithmo)
+        fig_comparativo = figura_cacheada(
+            'comparativo',
+            chave_proc_operacional,
+            lambda: Visualizations.criar_grafico_comparativo_mensal(df_evolucao_rithmo)
+        )
         st.plotly_chart(fig_comparativo, use_container_width=True)
     
     with tab3:
@@ -709,12 +1520,12 @@ def main():
             )
 
         with st.expander("🔍 Ver detalhamento por natureza"):
-            df_det = df_custo_m2.groupby('Natureza')['Saida'].sum().reset_index()
-            df_det['Total'] = df_det['Saida'].apply(lambda x: formatar_moeda(abs(x)))
-            df_det['Custo/m²'] = df_det['Saida'].apply(
-                lambda x: formatar_moeda(abs(x) / AREA_RITHMO_M2)
-            )
-            df_det = df_det.sort_values('Saida').reset_index(drop=True)
+            df_det = df_custo_m2.groupby('Natureza', observed=True, sort=False)['Saida'].sum().reset_index()
+            saida_abs_det = np.abs(df_det['Saida'].to_numpy())
+            df_det['Total'] = formatar_moeda_vetorizado(saida_abs_det)
+            df_det['Custo/m²'] = formatar_moeda_vetorizado(saida_abs_det / AREA_RITHMO_M2)
+            # Natureza desempata (o groupby não ordena mais as chaves)
+            df_det = df_det.sort_values(['Saida', 'Natureza']).reset_index(drop=True)
             st.dataframe(
                 df_det[['Natureza', 'Total', 'Custo/m²']],
                 hide_index=True,
@@ -726,17 +1537,29 @@ def main():
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            df_grupo = processor.agregacao_por_grupo(df_operacional_filtrado)
-            fig_grupo = Visualizations.criar_grafico_por_grupo(df_grupo, top_n=10)
+            df_grupo = calculo_cacheado(
+                'por_grupo',
+                chave_proc_operacional,
+                lambda: processor.agregacao_por_grupo(df_operacional_filtrado)
+            )
+            fig_grupo = figura_cacheada(
+                'grupo',
+                chave_proc_operacional,
+                lambda: Visualizations.criar_grafico_por_grupo(df_grupo, top_n=10)
+            )
             st.plotly_chart(fig_grupo, use_container_width=True)
         
         with col2:
             st.markdown("### 📊 Resumo por Grupo")
-            df_grupo_display = df_grupo.head(10).copy()
-            df_grupo_display['Saídas'] = df_grupo_display['Saida'].apply(lambda x: formatar_moeda(abs(x)))
-            df_grupo_display['Entradas'] = df_grupo_display['Entrada'].apply(formatar_moeda)
+            df_grupo_display = df_grupo.head(10)
+            # Valores formatados no padrão BR ("R$ 1.234,56") só nas 10 linhas exibidas
+            df_grupo_display = pd.DataFrame({
+                'Grupo': df_grupo_display['Grupo'],
+                'Entradas': formatar_moeda_vetorizado(df_grupo_display['Entrada'].to_numpy()),
+                'Saídas': formatar_moeda_vetorizado(np.abs(df_grupo_display['Saida'].to_numpy()))
+            })
             st.dataframe(
-                df_grupo_display[['Grupo', 'Entradas', 'Saídas']],
+                df_grupo_display,
                 hide_index=True,
                 use_container_width=True
             )
@@ -752,9 +1575,9 @@ def main():
         with col_despesas:
             st.markdown("### 💸 Despesas por Natureza")
             
-            # Obter grupos e subgrupos disponíveis para despesas
-            df_despesas = df_operacional_filtrado[df_operacional_filtrado['Saida'] < 0].copy()
-            grupos_despesas = sorted(df_despesas['Grupo'].unique().tolist())
+            # Obter grupos e subgrupos disponíveis para despesas (índices pré-calculados)
+            despesas_gs = indices_grupo_subgrupo(chave_proc_operacional, df_operacional_filtrado)['despesas']
+            grupos_despesas = list(despesas_gs['opcoes'])
             
             if len(grupos_despesas) > 0:
                 grupo_desp_selecionado = st.selectbox(
@@ -763,10 +1586,8 @@ def main():
                     key='grupo_despesas'
                 )
                 
-                # Filtrar subgrupos deste grupo
-                subgrupos_despesas = sorted(
-                    df_despesas[df_despesas['Grupo'] == grupo_desp_selecionado]['Subgrupo'].unique().tolist()
-                )
+                # Subgrupos deste grupo
+                subgrupos_despesas = despesas_gs['opcoes'][grupo_desp_selecionado]
                 
                 if len(subgrupos_despesas) > 0:
                     subgrupo_desp_selecionado = st.selectbox(
@@ -775,12 +1596,9 @@ def main():
                         key='subgrupo_despesas'
                     )
                     
-                    # Calcular total de despesas desta combinação
-                    df_filtrado_desp = df_operacional_filtrado[
-                        (df_operacional_filtrado['Grupo'] == grupo_desp_selecionado) &
-                        (df_operacional_filtrado['Subgrupo'] == subgrupo_desp_selecionado)
-                    ]
-                    total_despesas = abs(df_filtrado_desp['Saida'].sum())
+                    # Calcular total de despesas desta combinação (soma direto pelas posições)
+                    idx_desp = despesas_gs['indices'][(grupo_desp_selecionado, subgrupo_desp_selecionado)]
+                    total_despesas = abs(df_operacional_filtrado['Saida'].to_numpy()[idx_desp].sum())
                     
                     # Mostrar total
                     st.metric(
@@ -789,10 +1607,14 @@ def main():
                     )
                     
                     # Gerar e exibir gráfico
-                    fig_despesas = Visualizations.criar_grafico_despesas_por_natureza(
-                        df_operacional_filtrado,
-                        grupo_desp_selecionado,
-                        subgrupo_desp_selecionado
+                    fig_despesas = figura_cacheada(
+                        'despesas',
+                        chave_proc_operacional + (grupo_desp_selecionado, subgrupo_desp_selecionado),
+                        lambda: Visualizations.criar_grafico_despesas_por_natureza(
+                            df_operacional_filtrado,
+                            grupo_desp_selecionado,
+                            subgrupo_desp_selecionado
+                        )
                     )
                     st.plotly_chart(fig_despesas, use_container_width=True)
                 else:
@@ -804,9 +1626,9 @@ def main():
         with col_receitas:
             st.markdown("### 💰 Receitas por Natureza")
             
-            # Obter grupos e subgrupos disponíveis para receitas
-            df_receitas = df_operacional_filtrado[df_operacional_filtrado['Entrada'] > 0].copy()
-            grupos_receitas = sorted(df_receitas['Grupo'].unique().tolist())
+            # Obter grupos e subgrupos disponíveis para receitas (índices pré-calculados)
+            receitas_gs = indices_grupo_subgrupo(chave_proc_operacional, df_operacional_filtrado)['receitas']
+            grupos_receitas = list(receitas_gs['opcoes'])
             
             if len(grupos_receitas) > 0:
                 grupo_rec_selecionado = st.selectbox(
@@ -815,10 +1637,8 @@ def main():
                     key='grupo_receitas'
                 )
                 
-                # Filtrar subgrupos deste grupo
-                subgrupos_receitas = sorted(
-                    df_receitas[df_receitas['Grupo'] == grupo_rec_selecionado]['Subgrupo'].unique().tolist()
-                )
+                # Subgrupos deste grupo
+                subgrupos_receitas = receitas_gs['opcoes'][grupo_rec_selecionado]
                 
                 if len(subgrupos_receitas) > 0:
                     subgrupo_rec_selecionado = st.selectbox(
@@ -827,12 +1647,9 @@ def main():
                         key='subgrupo_receitas'
                     )
                     
-                    # Calcular total de receitas desta combinação
-                    df_filtrado_rec = df_operacional_filtrado[
-                        (df_operacional_filtrado['Grupo'] == grupo_rec_selecionado) &
-                        (df_operacional_filtrado['Subgrupo'] == subgrupo_rec_selecionado)
-                    ]
-                    total_receitas = df_filtrado_rec['Entrada'].sum()
+                    # Calcular total de receitas desta combinação (soma direto pelas posições)
+                    idx_rec = receitas_gs['indices'][(grupo_rec_selecionado, subgrupo_rec_selecionado)]
+                    total_receitas = df_operacional_filtrado['Entrada'].to_numpy()[idx_rec].sum()
                     
                     # Mostrar total
                     st.metric(
@@ -841,10 +1658,14 @@ def main():
                     )
                     
                     # Gerar e exibir gráfico
-                    fig_receitas = Visualizations.criar_grafico_receitas_por_natureza(
-                        df_operacional_filtrado,
-                        grupo_rec_selecionado,
-                        subgrupo_rec_selecionado
+                    fig_receitas = figura_cacheada(
+                        'receitas',
+                        chave_proc_operacional + (grupo_rec_selecionado, subgrupo_rec_selecionado),
+                        lambda: Visualizations.criar_grafico_receitas_por_natureza(
+                            df_operacional_filtrado,
+                            grupo_rec_selecionado,
+                            subgrupo_rec_selecionado
+                        )
                     )
                     st.plotly_chart(fig_receitas, use_container_width=True)
                 else:
@@ -874,29 +1695,15 @@ def main():
             df_analise = df_operacional_filtrado[df_operacional_filtrado['Grupo'] == grupo_selecionado].copy()
         
         if len(df_analise) > 0:
-            # Agregação por Subgrupo e Natureza
-            df_natureza_detalhado = df_analise.groupby(['Grupo', 'Subgrupo', 'Natureza']).agg({
-                'Entrada': 'sum',
-                'Saida': 'sum',
-                'Saldo': 'sum'
-            }).reset_index()
-            
-            df_natureza_detalhado['Saida_Abs'] = df_natureza_detalhado['Saida'].abs()
-            df_natureza_detalhado = df_natureza_detalhado.sort_values(['Grupo', 'Subgrupo', 'Saida_Abs'], ascending=[True, True, False])
+            # Agregação por Subgrupo e Natureza (cacheada por recorte + grupo)
+            chave_natureza = chave_proc_operacional + (grupo_selecionado,)
+            df_natureza_detalhado, df_subgrupo_resumo = agregar_natureza_subgrupo(chave_natureza, df_analise)
             
             # Resumo por Subgrupo
             st.markdown("### 📊 Resumo por Subgrupo")
-            df_subgrupo_resumo = df_analise.groupby(['Grupo', 'Subgrupo']).agg({
-                'Entrada': 'sum',
-                'Saida': 'sum',
-                'Saldo': 'sum'
-            }).reset_index()
-            
-            df_subgrupo_resumo['Saida_Abs'] = df_subgrupo_resumo['Saida'].abs()
-            df_subgrupo_resumo = df_subgrupo_resumo.sort_values(['Grupo', 'Saida_Abs'], ascending=[True, False])
             
-            # Gráfico de barras por subgrupo
-            fig_subgrupo = go.Figure()
+            # Gráfico de barras por subgrupo (uma chamada; Plotly Express separa os grupos)
+            import plotly.express as px
             
             cores_grupo_subgrupo = {
                 'BARILOCHE': '#f97316',
@@ -904,20 +1711,28 @@ def main():
                 'NORTHSIDE': '#3b82f6',
                 'ÁGATA':     '#8b5cf6',
             }
-            for grupo in df_subgrupo_resumo['Grupo'].unique():
-                df_grupo_temp = df_subgrupo_resumo[df_subgrupo_resumo['Grupo'] == grupo]
-                cor = cores_grupo_subgrupo.get(grupo, '#6b7280')
-                fig_subgrupo.add_trace(
-                    go.Bar(
-                        name=grupo,
-                        x=df_grupo_temp['Subgrupo'],
-                        y=df_grupo_temp['Saida_Abs'],
-                        text=df_grupo_temp['Saida_Abs'].apply(lambda x: f'R$ {x:,.0f}'),
-                        textposition='outside',
-                        marker=dict(color=cor, opacity=0.85, cornerradius=8),
-                        hovertemplate='<b>%{x}</b><br>Valor: R$ %{y:,.2f}<extra></extra>'
-                    )
-                )
+            cores_grupo_subgrupo.update({
+                grupo: '#6b7280'
+                for grupo in df_subgrupo_resumo['Grupo'].unique()
+                if grupo not in cores_grupo_subgrupo
+            })
+            
+            # Rótulos formatados uma única vez para o resumo inteiro
+            df_subgrupo_resumo['text'] = df_subgrupo_resumo['Saida_Abs'].map('R$ {:,.0f}'.format)
+            fig_subgrupo = px.bar(
+                df_subgrupo_resumo,
+                x='Subgrupo',
+                y='Saida_Abs',
+                color='Grupo',
+                text='text',
+                barmode='group',
+                color_discrete_map=cores_grupo_subgrupo
+            )
+            fig_subgrupo.update_traces(
+                textposition='outside',
+                marker=dict(opacity=0.85, cornerradius=8),
+                hovertemplate='<b>%{x}</b><br>Valor: R$ %{y:,.2f}<extra></extra>'
+            )
 
             fig_subgrupo.update_layout(
                 title='Comparativo de Saídas por Subgrupo e Grupo',
@@ -944,56 +1759,43 @@ def main():
             st.markdown("---")
             st.markdown("### 📋 Detalhamento por Grupo, Subgrupo e Natureza")
             
-            # Criar tabela formatada
-            for grupo in df_natureza_detalhado['Grupo'].unique():
+            # Criar tabela formatada de todos os grupos de uma vez: cabeçalhos de
+            # subgrupo (ordem 0), naturezas (ordem 1) e total do grupo (ordem 2)
+            # Totais reaproveitam o resumo por subgrupo já agregado (gráfico acima)
+            colunas_valor = ['Entrada', 'Saida', 'Saldo']
+            totais_subgrupo = df_subgrupo_resumo[['Grupo', 'Subgrupo'] + colunas_valor].copy()
+            totais_subgrupo['Subgrupo/Natureza'] = '🔵 ' + totais_subgrupo['Subgrupo'].astype(str)
+            totais_subgrupo['ordem'] = 0
+            
+            linhas_natureza = df_natureza_detalhado[['Grupo', 'Subgrupo', 'Natureza'] + colunas_valor].copy()
+            linhas_natureza['Subgrupo/Natureza'] = '    ↳ ' + linhas_natureza['Natureza'].astype(str)
+            linhas_natureza['ordem'] = 1
+            
+            totais_grupo = totais_subgrupo.groupby('Grupo', sort=False)[colunas_valor].sum().reset_index()
+            totais_grupo['Subgrupo/Natureza'] = '**TOTAL ' + totais_grupo['Grupo'].astype(str) + '**'
+            totais_grupo['ordem'] = 2
+            
+            # Total do grupo sem Subgrupo (NaN) fica por último dentro do grupo;
+            # ordenação estável preserva a ordem das naturezas no subgrupo
+            tabela = pd.concat([totais_subgrupo, linhas_natureza, totais_grupo], ignore_index=True)
+            tabela = tabela.sort_values(['Grupo', 'Subgrupo', 'ordem'], kind='stable', na_position='last', ignore_index=True)
+            
+            eh_total = (tabela['ordem'] == 2).to_numpy()
+            tabela_display = pd.DataFrame({'Grupo': tabela['Grupo'], 'Subgrupo/Natureza': tabela['Subgrupo/Natureza']})
+            for coluna, rotulo in (('Entrada', 'Entradas'), ('Saida', 'Saídas'), ('Saldo', 'Saldo')):
+                valores = tabela[coluna].to_numpy()
+                if coluna == 'Saida':
+                    valores = np.abs(valores)
+                formatados = formatar_moeda_vetorizado(valores)
+                tabela_display[rotulo] = np.where(eh_total, '**' + formatados + '**', formatados)
+            
+            for grupo, df_display in tabela_display.groupby('Grupo', sort=False):
                 with st.expander(f"**{grupo}**", expanded=(grupo_selecionado != 'TODOS')):
-                    df_grupo = df_natureza_detalhado[df_natureza_detalhado['Grupo'] == grupo].copy()
-                    
-                    # Criar tabela pivotada
-                    tabela_display = []
-                    
-                    for subgrupo in df_grupo['Subgrupo'].unique():
-                        df_sub = df_grupo[df_grupo['Subgrupo'] == subgrupo]
-                        
-                        # Linha de cabeçalho do subgrupo
-                        total_entrada = df_sub['Entrada'].sum()
-                        total_saida = df_sub['Saida'].sum()
-                        total_saldo = df_sub['Saldo'].sum()
-                        
-                        tabela_display.append({
-                            'Subgrupo/Natureza': f"🔵 {subgrupo}",
-                            'Entradas': formatar_moeda(total_entrada),
-                            'Saídas': formatar_moeda(abs(total_saida)),
-                            'Saldo': formatar_moeda(total_saldo)
-                        })
-                        
-                        # Linhas de natureza
-                        for _, row in df_sub.iterrows():
-                            tabela_display.append({
-                                'Subgrupo/Natureza': f"    ↳ {row['Natureza']}",
-                                'Entradas': formatar_moeda(row['Entrada']),
-                                'Saídas': formatar_moeda(abs(row['Saida'])),
-                                'Saldo': formatar_moeda(row['Saldo'])
-                            })
-                    
-                    # Total do grupo
-                    total_grupo_entrada = df_grupo['Entrada'].sum()
-                    total_grupo_saida = df_grupo['Saida'].sum()
-                    total_grupo_saldo = df_grupo['Saldo'].sum()
-                    
-                    tabela_display.append({
-                        'Subgrupo/Natureza': f"**TOTAL {grupo}**",
-                        'Entradas': f"**{formatar_moeda(total_grupo_entrada)}**",
-                        'Saídas': f"**{formatar_moeda(abs(total_grupo_saida))}**",
-                        'Saldo': f"**{formatar_moeda(total_grupo_saldo)}**"
-                    })
-                    
-                    df_display = pd.DataFrame(tabela_display)
                     st.dataframe(
-                        df_display,
+                        df_display.drop(columns='Grupo'),
                         hide_index=True,
                         use_container_width=True,
-                        height=min(600, len(tabela_display) * 35 + 50)
+                        height=min(600, len(df_display) * 35 + 50)
                     )
             
             # Opção de download
@@ -1004,16 +1806,17 @@ def main():
             
             with col1:
                 # Preparar dados para exportação
-                df_export = df_natureza_detalhado.copy()
-                df_export['Entradas'] = df_export['Entrada'].apply(lambda x: f"{x:.2f}".replace('.', ','))
-                df_export['Saídas'] = df_export['Saida'].apply(lambda x: f"{abs(x):.2f}".replace('.', ','))
-                df_export['Saldo'] = df_export['Saldo'].apply(lambda x: f"{x:.2f}".replace('.', ','))
+                def construir_csv_natureza():
+                    df_export = df_natureza_detalhado.copy()
+                    df_export['Entradas'] = df_export['Entrada'].map('{:.2f}'.format).str.replace('.', ',', regex=False)
+                    df_export['Saídas'] = df_export['Saida'].abs().map('{:.2f}'.format).str.replace('.', ',', regex=False)
+                    df_export['Saldo'] = df_export['Saldo'].map('{:.2f}'.format).str.replace('.', ',', regex=False)
+                    
+                    return gerar_csv_bytes(
+                        df_export[['Grupo', 'Subgrupo', 'Natureza', 'Entradas', 'Saídas', 'Saldo']]
+                    )
                 
-                csv_natureza = df_export[['Grupo', 'Subgrupo', 'Natureza', 'Entradas', 'Saídas', 'Saldo']].to_csv(
-                    index=False, 
-                    encoding='utf-8-sig', 
-                    sep=';'
-                )
+                csv_natureza = calculo_cacheado('csv_natureza', chave_natureza, construir_csv_natureza)
                 
                 st.download_button(
                     label="📥 Baixar Análise por Natureza (CSV)",
@@ -1031,14 +1834,18 @@ def main():
         col1, col2 = st.columns([2, 1])
         
         with col1:
-            df_fornecedores = processor.top_fornecedores(df_operacional_filtrado, n=15, tipo='saida')
+            df_fornecedores = calculo_cacheado(
+                'top_fornecedores',
+                chave_proc_operacional,
+                lambda: processor.top_fornecedores(df_operacional_filtrado, n=15, tipo='saida')
+            )
             fig_fornecedores = Visualizations.criar_grafico_fornecedores(df_fornecedores, top_n=15)
             st.plotly_chart(fig_fornecedores, use_container_width=True)
         
         with col2:
             st.markdown("### 🏆 Top 15 Fornecedores")
             df_forn_display = df_fornecedores.copy()
-            df_forn_display['Total'] = df_forn_display['Valor_Abs'].apply(formatar_moeda)
+            df_forn_display['Total'] = formatar_moeda_vetorizado(df_forn_display['Valor_Abs'].to_numpy())
             st.dataframe(
                 df_forn_display[['FORNECEDOR', 'Total']],
                 hide_index=True,
@@ -1047,373 +1854,14 @@ def main():
             )
     
     with tab7:
-        st.success("🔍 **Visão Completa** - Inclui todas as movimentações financeiras para análise de aportes e auditoria")
-        st.subheader("💰 Análise Financeira - Aportes SCP")
-        
-        # Configuração da taxa de juros e opção BARILOCHE
-        col_info1, col_config1, col_config2 = st.columns([2, 1, 1])
-        
-        with col_info1:
-            st.info("📊 Esta seção analisa os **Aportes de Capital SCP** e calcula o valor corrigido por juros compostos.")
-        
-        with col_config1:
-            taxa_juros = st.number_input(
-                "Taxa mensal (%)",
-                min_value=0.0,
-                max_value=10.0,
-                value=0.9477,
-                step=0.0001,
-                format="%.4f"
-            )
-        
-        with col_config2:
-            considerar_bariloche = st.checkbox(
-                "🏔️ BARILOCHE como pagamento",
-                value=True,
-                help="Considera gastos com BARILOCHE como amortizações dos aportes, reduzindo a base de cálculo dos juros"
-            )
-        
-        # Calcular aportes corrigidos
-        analise_aportes = processor.calcular_aportes_corrigidos(
-            taxa_juros_mensal=taxa_juros,
-            considerar_bariloche_como_pagamento=considerar_bariloche
-        )
-        
-        if analise_aportes['total_aportes_original'] > 0:
-            # KPIs de Aportes
-            st.markdown("### 📊 Resumo de Aportes SCP")
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "💵 Total Original",
-                    formatar_moeda(analise_aportes['total_aportes_original'])
-                )
-            
-            with col2:
-                st.metric(
-                    "📈 Total Corrigido",
-                    formatar_moeda(analise_aportes['total_corrigido'])
-                )
-            
-            with col3:
-                percentual_juros = (analise_aportes['total_juros'] / analise_aportes['total_aportes_original']) * 100
-                st.metric(
-                    "💸 Juros Acumulados",
-                    formatar_moeda(analise_aportes['total_juros']),
-                    delta=f"+{percentual_juros:.1f}%"
-                )
-            
-            with col4:
-                st.metric(
-                    "📅 Data Base",
-                    analise_aportes['data_base_calculo'].strftime('%d/%m/%Y')
-                )
-            
-            st.markdown("---")
-            
-            # Mostrar amortizações BARILOCHE se opção ativada
-            if considerar_bariloche and len(analise_aportes.get('amortizacoes_bariloche', [])) > 0:
-                st.info(
-                    f"🏔️ **Modo BARILOCHE ativado:** {len(analise_aportes['amortizacoes_bariloche'])} "
-                    f"amortizações sendo consideradas como pagamentos dos aportes"
-                )
-                
-                with st.expander("📋 Ver detalhes das amortizações BARILOCHE"):
-                    total_amortizado = sum(a['valor'] for a in analise_aportes['amortizacoes_bariloche'])
-                    st.metric("💰 Total Amortizado (BARILOCHE)", formatar_moeda(total_amortizado))
-                    
-                    # Tabela de amortizações
-                    df_amort = pd.DataFrame(analise_aportes['amortizacoes_bariloche'])
-                    df_amort['Data_Display'] = pd.to_datetime(df_amort['data']).dt.strftime('%d/%m/%Y')
-                    df_amort['Valor_Display'] = df_amort['valor'].apply(formatar_moeda)
-                    
-                    st.dataframe(
-                        df_amort[['Data_Display', 'Valor_Display', 'natureza', 'fornecedor']].rename(columns={
-                            'Data_Display': 'Data',
-                            'Valor_Display': 'Valor',
-                            'natureza': 'Natureza',
-                            'fornecedor': 'Fornecedor'
-                        }),
-                        hide_index=True,
-                        use_container_width=True,
-                        height=min(300, len(df_amort) * 35 + 50)
-                    )
-                
-                st.markdown("---")
-            
-            # MEMORIAL DE CÁLCULO
-            st.markdown("### 📋 Memorial de Cálculo")
-            st.info("🔍 **Auditoria Completa:** Este memorial mostra exatamente como os juros foram calculados, similar a uma planilha Excel auditável.")
-            
-            with st.expander("📊 Ver Memorial de Cálculo Detalhado", expanded=False):
-                if len(analise_aportes.get('memorial_calculo', [])) > 0:
-                    # Converter memorial para DataFrame
-                    df_memorial = pd.DataFrame(analise_aportes['memorial_calculo'])
-                    
-                    # Formatação para exibição
-                    df_memorial['Valor_Original_Display'] = df_memorial['valor_original'].apply(formatar_moeda)
-                    df_memorial['Valor_Corrigido_Display'] = df_memorial['valor_corrigido'].apply(formatar_moeda)
-                    df_memorial['Juros_Display'] = df_memorial['juros_acumulados'].apply(formatar_moeda)
-                    df_memorial['Fator_Juros_Display'] = df_memorial['fator_juros'].apply(lambda x: f"{x:.8f}")
-                    
-                    # Colunas para exibição
-                    colunas_exibir = [
-                        'data_aporte', 'Valor_Original_Display', 'meses_decorridos', 
-                        'taxa_mensal', 'Fator_Juros_Display', 'Valor_Corrigido_Display', 
-                        'Juros_Display', 'formula'
-                    ]
-                    
-                    # Renomear colunas para exibição
-                    df_display = df_memorial[colunas_exibir].copy()
-                    df_display.columns = [
-                        'Data', 'Valor Original', 'Meses', 'Taxa (%)', 
-                        'Fator Juros', 'Valor Corrigido', 'Juros', 'Fórmula'
-                    ]
-                    
-                    st.dataframe(
-                        df_display,
-                        hide_index=True,
-                        use_container_width=True,
-                        height=min(400, len(df_memorial) * 35 + 50)
-                    )
-                    
-                    # Resumo do memorial
-                    st.markdown("#### 📈 Resumo do Memorial:")
-                    col_res1, col_res2, col_res3 = st.columns(3)
-                    
-                    with col_res1:
-                        st.metric(
-                            "📅 Total de Etapas",
-                            len(df_memorial)
-                        )
-                    
-                    with col_res2:
-                        st.metric(
-                            "💰 Valor Final",
-                            formatar_moeda(analise_aportes['total_corrigido'])
-                        )
-                    
-                    with col_res3:
-                        st.metric(
-                            "📊 Taxa Aplicada",
-                            f"{analise_aportes['taxa_juros']:.4f}% a.m."
-                        )
-                    
-                    # Opção para download do memorial
-                    st.markdown("#### 💾 Exportar Memorial:")
-                    if st.button("📥 Baixar Memorial de Cálculo (Excel)"):
-                        # Criar arquivo Excel com memorial
-                        output = io.BytesIO()
-                        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                            # Memorial detalhado
-                            df_memorial.to_excel(writer, sheet_name='Memorial_Calculo', index=False)
-                            
-                            # Resumo
-                            resumo_data = {
-                                'Métrica': ['Total Aportes Original', 'Total Corrigido', 'Total Juros', 'Taxa Mensal (%)', 'Data Base'],
-                                'Valor': [
-                                    analise_aportes['total_aportes_original'],
-                                    analise_aportes['total_corrigido'],
-                                    analise_aportes['total_juros'],
-                                    analise_aportes['taxa_juros'],
-                                    analise_aportes['data_base_calculo'].strftime('%d/%m/%Y')
-                                ]
-                            }
-                            pd.DataFrame(resumo_data).to_excel(writer, sheet_name='Resumo', index=False)
-                        
-                        st.download_button(
-                            label="📥 Download Memorial de Cálculo.xlsx",
-                            data=output.getvalue(),
-                            file_name=f"Memorial_Calculo_Aportes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                else:
-                    st.warning("⚠️ Nenhum memorial de cálculo disponível.")
-            
-            # Alerta destacado
-            st.error(f"🚨 **DÍVIDA TOTAL CORRIGIDA:** {formatar_moeda(analise_aportes['total_corrigido'])} "
-                    f"(Taxa: {taxa_juros}% a.m.)")
-            
-            st.markdown("---")
-            
-            # Gráficos - Layout organizado e simétrico
-            st.markdown("### 📈 Visualizações Gráficas")
-            
-            # Linha 1: Evolução Acumulativa (destaque - largura total)
-            st.markdown("#### 📊 Evolução Acumulativa do Capital + Juros")
-            fig_acumulativo = Visualizations.criar_grafico_aportes_acumulativo(
-                analise_aportes['aportes_detalhados']
-            )
-            st.plotly_chart(fig_acumulativo, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # Linha 2: Dois gráficos lado a lado (simétrico)
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("#### 📊 Evolução Individual dos Aportes")
-                fig_aportes = Visualizations.criar_grafico_aportes_corrigidos(
-                    analise_aportes['aportes_detalhados']
-                )
-                st.plotly_chart(fig_aportes, use_container_width=True)
-            
-            with col2:
-                st.markdown("#### 💸 Juros por Aporte (Top 15)")
-                fig_juros = Visualizations.criar_grafico_juros_acumulados(
-                    analise_aportes['aportes_detalhados']
-                )
-                st.plotly_chart(fig_juros, use_container_width=True)
-            
-            # Tabela detalhada de aportes
-            st.markdown("---")
-            st.markdown("### 📋 Detalhamento dos Aportes")
-            
-            df_aportes_display = analise_aportes['aportes_detalhados'].copy()
-            df_aportes_display['Data_Display'] = df_aportes_display['Data'].dt.strftime('%d/%m/%Y')
-            df_aportes_display['Original'] = df_aportes_display['Entrada'].apply(formatar_moeda)
-            df_aportes_display['Corrigido'] = df_aportes_display['Valor_Corrigido'].apply(formatar_moeda)
-            df_aportes_display['Juros'] = df_aportes_display['Juros_Acumulados'].apply(formatar_moeda)
-            df_aportes_display['Meses'] = df_aportes_display['Meses_Decorridos'].apply(lambda x: f"{x:.1f}")
-            
-            st.dataframe(
-                df_aportes_display[['Data_Display', 'Grupo', 'Natureza', 'Original', 
-                                   'Meses', 'Juros', 'Corrigido']].rename(columns={
-                    'Data_Display': 'Data',
-                    'Original': 'Valor Original',
-                    'Corrigido': 'Valor Corrigido',
-                    'Meses': 'Meses Decorridos'
-                }),
-                hide_index=True,
-                use_container_width=True,
-                height=400
-            )
-        else:
-            st.warning("⚠️ Nenhum aporte SCP encontrado nos dados.")
-        
-        # Análise do Subgrupo Financeiro
-        st.markdown("---")
-        st.markdown("### 💼 Análise do Subgrupo FINANCEIRO")
-        
-        analise_fin = processor.analise_subgrupo_financeiro()
-        
-        if analise_fin['num_transacoes'] > 0:
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric(
-                    "📥 Entradas Financeiras",
-                    formatar_moeda(analise_fin['total_entradas'])
-                )
-            
-            with col2:
-                st.metric(
-                    "📤 Saídas Financeiras",
-                    formatar_moeda(analise_fin['total_saidas'])
-                )
-            
-            with col3:
-                st.metric(
-                    "💰 Saldo Financeiro",
-                    formatar_moeda(analise_fin['saldo'])
-                )
-            
-            with col4:
-                st.metric(
-                    "📊 Transações",
-                    f"{analise_fin['num_transacoes']:,}".replace(',', '.')
-                )
-            
-            st.markdown("---")
-            
-            # Gráfico de distribuição por natureza
-            fig_fin = Visualizations.criar_grafico_financeiro_natureza(analise_fin['df_financeiro'])
-            st.plotly_chart(fig_fin, use_container_width=True)
-            
-            # Tabela por natureza
-            st.markdown("### 📊 Resumo por Natureza")
-            df_nat_display = analise_fin['por_natureza'].copy()
-            df_nat_display['Entradas'] = df_nat_display['Entrada'].apply(formatar_moeda)
-            df_nat_display['Saídas'] = df_nat_display['Saida'].apply(lambda x: formatar_moeda(abs(x)))
-            df_nat_display['Saldo'] = df_nat_display['Saldo'].apply(formatar_moeda)
-            
-            st.dataframe(
-                df_nat_display[['Natureza', 'Entradas', 'Saídas', 'Saldo']],
-                hide_index=True,
-                use_container_width=True
-            )
-        else:
-            st.info("ℹ️ Nenhuma transação financeira encontrada no período filtrado.")
+        renderizar_analise_financeira(processor)
     
     with tab8:
-        st.subheader("Dados Detalhados")
-        
-        # Seletor de visão
-        col_visao, col_busca, col_linhas = st.columns([1, 2, 1])
-        
-        with col_visao:
-            tipo_visao = st.radio(
-                "Visão dos Dados",
-                ["Operacional", "Completa"],
-                index=0,
-                help="Operacional: sem transferências internas | Completa: todas as transações"
-            )
-        
-        with col_busca:
-            busca = st.text_input("🔍 Buscar (fornecedor, natureza, grupo...)", "")
-        
-        with col_linhas:
-            num_linhas = st.selectbox("Linhas/página", [50, 100, 200, 500], index=1)
-        
-        # Selecionar DataFrame baseado na visão escolhida
-        df_display = df_operacional_filtrado.copy() if tipo_visao == "Operacional" else df_completo_filtrado.copy()
-        
-        # Indicador visual da visão ativa
-        if tipo_visao == "Operacional":
-            st.info("🎯 Exibindo **Visão Operacional** - Transferências internas excluídas")
-        else:
-            st.success("🔍 Exibindo **Visão Completa** - Todas as movimentações incluídas")
-        if busca:
-            mask = (
-                df_display['FORNECEDOR'].str.contains(busca, case=False, na=False) |
-                df_display['Natureza'].str.contains(busca, case=False, na=False) |
-                df_display['Grupo'].str.contains(busca, case=False, na=False)
-            )
-            df_display = df_display[mask]
-        
-        # Preparar para exibição
-        df_display['Data_Display'] = df_display['Data'].dt.strftime('%d/%m/%Y')
-        df_display['Entrada_Display'] = df_display['Entrada'].apply(formatar_moeda)
-        df_display['Saida_Display'] = df_display['Saida'].apply(lambda x: formatar_moeda(abs(x)))
-        df_display['Saldo_Display'] = df_display['Saldo'].apply(formatar_moeda)
-        
-        colunas_exibir = ['Data_Display', 'Grupo', 'Subgrupo', 'Natureza', 'FORNECEDOR', 
-                         'Entrada_Display', 'Saida_Display', 'Saldo_Display']
-        
-        st.dataframe(
-            df_display[colunas_exibir].head(num_linhas),
-            hide_index=True,
-            use_container_width=True,
-            height=600
+        renderizar_dados_detalhados(
+            df_operacional_filtrado,
+            df_completo_filtrado,
+            (chave_proc_completo, chave_proc_operacional)
         )
-        
-        # Botão de download
-        st.markdown("---")
-        col1, col2, col3 = st.columns([1, 1, 2])
-        
-        with col1:
-            csv = df_display.to_csv(index=False, encoding='utf-8-sig', sep=';')
-            st.download_button(
-                label="📥 Baixar CSV",
-                data=csv,
-                file_name=f"dados_financeiros_{tipo_visao.lower()}_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
-            )
-        
-        with col2:
-            # Estatísticas rápidas
-            st.metric("Total de Registros", f"{len(df_display):,}".replace(',', '.'))
     
     # Footer
     st.markdown("---")
@@ -42,8 +42,23 @@ def main():
         "--hidden-import=streamlit",
         "--hidden-import=plotly",
         "--hidden-import=pandas",
-        "--collect-all=streamlit",
-        "--collect-all=plotly",
+        # Coleta só o necessário (--collect-all levava todos os submódulos e
+        # testes): menos bytes para o bootloader ler na inicialização
+        "--collect-submodules=streamlit",
+        "--collect-data=streamlit",
+        "--copy-metadata=streamlit",
+        # app.py e src/ vão como dados (--add-data) e não passam pela análise de
+        # imports: plotly.express/plotly.subplots precisam ser coletados aqui
+        "--collect-submodules=plotly",
+        "--collect-data=plotly",
+        "--exclude-module=tkinter",
+        "--exclude-module=pytest",
+        "--exclude-module=IPython",
+        "--exclude-module=matplotlib.tests",
+        "--exclude-module=pandas.tests",
+        "--exclude-module=numpy.tests",
+        "--noupx",  # Sem descompactação UPX a cada inicialização
+        "--optimize=1",  # Bytecode sem asserts (PyInstaller 6+)
         "launcher.py"
     ]
     
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Carregamento compartilhado do Fluxo Financeiro para os scripts de analise
+(leitura, limpeza de valores, sinal das saidas, saldo e normalizacao de textos)
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.utils import (
+    _TROCA_SEPARADORES,
+    formatar_moeda_vetorizado,
+    limpar_valor_monetario_vetorizado,
+)
+
+try:
+    # Opcional: soma multi-thread sem temporários em arquivos grandes
+    import numexpr
+except ImportError:
+    numexpr = None
+
+ARQUIVO_PADRAO = 'Fluxo Financeiro.csv'
+
+# Colunas do CSV efetivamente consumidas pelas análises
+COLUNAS_CSV = [
+    'Content.Grupo',
+    'Content.Subgrupo',
+    'Content.Natureza',
+    'Content.Entrada (R$)',
+    'Content.Saída (R$)',
+    'Name'
+]
+
+# Colunas do DataFrame pronto (e do cache Parquet)
+COLUNAS_PRONTAS = [
+    'Grupo', 'Subgrupo', 'Natureza', 'Conta',
+    'Entrada', 'Saida', 'Saldo', 'Transferencia'
+]
+
+# Linhas por bloco na leitura do CSV (limita a memória de pico em arquivos grandes)
+TAMANHO_BLOCO = 200_000
+
+
+def contains_cat(s, padrao, regex=True):
+    """str.contains avaliado sobre as categorias (poucas) e expandido pelos códigos"""
+    por_categoria = s.cat.categories.str.contains(padrao, regex=regex, na=False)
+    # Código -1 (valor ausente) indexa o False acrescentado ao final
+    por_categoria = np.append(por_categoria, False)
+    return pd.Series(por_categoria[s.cat.codes.to_numpy()], index=s.index)
+
+
+def valor_col(s):
+    """
+    Garante coluna monetária em float64
+
+    O parser do read_csv já converte o formato BR (decimal=',', thousands='.');
+    se alguma célula fora do padrão deixar a coluna como texto, cai na limpeza
+    vetorizada de src.utils (a mesma usada pelo dashboard).
+    """
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(np.float64).fillna(0.0)
+    return limpar_valor_monetario_vetorizado(s)
+
+
+@lru_cache(maxsize=4096)
+def BR(x):
+    """Formata valor como moeda BR ("R$ 1.234,56"); totais repetidos vêm do cache"""
+    return "R$ " + f"{x:,.2f}".translate(_TROCA_SEPARADORES)
+
+
+def BR_series(s):
+    """Formata uma Series inteira como moeda BR ("R$ 1.234,56") de uma vez (via src.utils)"""
+    return pd.Series(formatar_moeda_vetorizado(s.to_numpy()), index=s.index)
+
+
+def categoria_normalizada(s, normalizar):
+    """
+    Converte para Categorical aplicando a normalização só às categorias distintas
+
+    Args:
+        s: Series de texto
+        normalizar: Função aplicada ao Index de categorias (ex: str.upper)
+
+    Returns:
+        pd.Categorical: Categorias já normalizadas (ordenadas)
+    """
+    cat = pd.Categorical(s)
+    normalizadas = normalizar(cat.categories)
+    # Ausentes (código -1) viram '' sem fillna na coluna inteira: o '' é
+    # acrescentado ao final e o código -1 o indexa
+    if (cat.codes == -1).any():
+        normalizadas = normalizadas.append(pd.Index(['']))
+    # Categorias distintas podem coincidir após normalizar ("Agata"/"AGATA"):
+    # factorize reagrupa os códigos antigos nas categorias resultantes
+    codigos, categorias = pd.factorize(normalizadas, sort=True)
+    return pd.Categorical.from_codes(codigos[cat.codes], categories=categorias)
+
+
+def _limpar_bloco(df):
+    """Limpa um bloco do CSV (valores, sinal e saldo)"""
+    # Limpar nomes de colunas
+    df.columns = df.columns.str.replace('Content.', '', regex=False)
+
+    # Entrada e Saida num único array (N, 2): arredondados ao centavo uma única
+    # vez, saída forçada negativa e saldo numa só soma por linha. Mantidos em
+    # float64 porque float32 (~7 dígitos) já perde centavos acima de ~R$ 167 mil
+    valores = np.empty((len(df), 2), dtype=np.float64)
+    valores[:, 0] = valor_col(df['Entrada (R$)'])
+    valores[:, 1] = valor_col(df['Saída (R$)'])
+    np.round(valores, 2, out=valores)
+    np.abs(valores[:, 1], out=valores[:, 1])
+    np.negative(valores[:, 1], out=valores[:, 1])
+
+    df['Entrada'] = valores[:, 0]
+    df['Saida'] = valores[:, 1]
+    if numexpr is not None:
+        df['Saldo'] = numexpr.evaluate('e + s', local_dict={'e': valores[:, 0], 's': valores[:, 1]})
+    else:
+        df['Saldo'] = valores.sum(axis=1)
+
+    df['Conta'] = df['Name']
+
+    return df[['Grupo', 'Subgrupo', 'Natureza', 'Conta', 'Entrada', 'Saida', 'Saldo']]
+
+
+def _ler_csv(path):
+    """Lê o CSV em blocos e devolve o DataFrame já limpo e normalizado"""
+    blocos = pd.read_csv(
+        path,
+        sep=';',
+        encoding='utf-8',
+        usecols=COLUNAS_CSV,
+        # Valores BR convertidos direto no tokenizador C ("1.234,56" -> 1234.56)
+        decimal=',',
+        thousands='.',
+        na_values=['', '-'],
+        chunksize=TAMANHO_BLOCO
+    )
+    df = pd.concat([_limpar_bloco(bloco) for bloco in blocos], ignore_index=True)
+
+    # Normalizar textos já como categóricas, só após o concat (categorias
+    # diferentes por bloco virariam object); poucas categorias -> códigos int8
+    for col in ['Natureza', 'Subgrupo', 'Grupo']:
+        df[col] = categoria_normalizada(df[col], lambda c: c.str.upper())
+    df['Conta'] = categoria_normalizada(df['Conta'], lambda c: c.str.strip())
+
+    # Marcador pré-calculado: permite filtrar transferências já na leitura do Parquet
+    df['Transferencia'] = contains_cat(df['Natureza'], 'TRANSF. ENTRE CONTAS', regex=False)
+
+    return df[COLUNAS_PRONTAS]
+
+
+def carregar_fluxo(path=ARQUIVO_PADRAO, colunas=None, sem_transferencias=False):
+    """
+    Carrega o Fluxo Financeiro pronto para análise, com cache em Parquet
+
+    O CSV só é reprocessado quando é mais novo que o cache (ou o cache não
+    existe / não tem as colunas pedidas); nas demais execuções a leitura é
+    feita do Parquet, apenas com as colunas solicitadas.
+
+    Args:
+        path: Caminho do CSV
+        colunas: Colunas desejadas (None = todas)
+        sem_transferencias: Se True, descarta as transferências entre contas
+            (filtro aplicado na leitura do Parquet)
+
+    Returns:
+        pd.DataFrame: Grupo, Subgrupo, Natureza, Conta (categóricas),
+        Entrada, Saida (<= 0), Saldo e Transferencia
+    """
+    cache = path + '.parquet'
+    filtros = [('Transferencia', '==', False)] if sem_transferencias else None
+
+    if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(cache, columns=colunas, filters=filtros)
+        except (ImportError, OSError, ValueError, KeyError):
+            # Sem engine Parquet ou cache de versão antiga: reprocessa o CSV
+            pass
+
+    df = _ler_csv(path)
+
+    try:
+        df.to_parquet(cache, index=False)
+    except (ImportError, OSError):
+        # Sem engine Parquet (ou sem permissão de escrita): segue sem cache
+        pass
+
+    if sem_transferencias:
+        df = df[~df['Transferencia']].reset_index(drop=True)
+
+    return df if colunas is None else df[colunas]
@@ -3,122 +3,189 @@
 Script para investigar o liquido de R$ 90.074,15 nas transferencias
 """
 
-import pandas as pd
+import hashlib
+import os
+import sys
 
-def BR(x):
-    return f"R$ {x:,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+import numpy as np
+import pandas as pd
 
-# Carregar CSV
-df = pd.read_csv('Fluxo Financeiro.csv', sep=';', encoding='utf-8')
+import fluxo_loader
+import src.utils
+from fluxo_loader import ARQUIVO_PADRAO, BR, carregar_fluxo
+
+# Relatório pronto guardado ao lado do CSV; a 1a linha é a chave de conteúdo
+CACHE_RELATORIO = ARQUIVO_PADRAO + '.transferencias.txt'
+
+# Linhas de separação e formato de linha reutilizados em todo o relatório
+LINHA = "=" * 80
+SEPARADOR = "-" * 80
+FORMATO_SALDO_CONTA = "{:20} -> {}"
+
+
+def agregar_por_categoria(coluna, valores, mascara=None):
+    """
+    Soma colunas numéricas por categoria numa única passada de bincount sobre os códigos
+
+    Args:
+        coluna: Series categórica usada como chave (ex: Conta, Grupo)
+        valores: Dict nome -> array float64 a somar
+        mascara: Array booleano opcional restringindo as linhas
+
+    Returns:
+        pd.DataFrame: Uma linha por categoria presente (ordem de aparição),
+        com as somas e a contagem 'n'
+    """
+    codigos = coluna.cat.codes.to_numpy()
+    if mascara is not None:
+        codigos = codigos[mascara]
+        valores = {nome: v[mascara] for nome, v in valores.items()}
+
+    n_categorias = len(coluna.cat.categories)
+    presentes = pd.unique(codigos)
+
+    dados = {
+        nome: np.bincount(codigos, weights=v, minlength=n_categorias)[presentes]
+        for nome, v in valores.items()
+    }
+    dados['n'] = np.bincount(codigos, minlength=n_categorias)[presentes]
+    return pd.DataFrame(dados, index=coluna.cat.categories[presentes])
+
+
+def chave_conteudo():
+    """Hash do CSV e do código que gera o relatório (muda se qualquer um mudar)"""
+    h = hashlib.blake2b(digest_size=16)
+    # src.utils: limpeza de valores e separadores do BR() usados pelo fluxo_loader
+    for caminho in (ARQUIVO_PADRAO, __file__, fluxo_loader.__file__, src.utils.__file__):
+        with open(caminho, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def montar_relatorio():
+    """Calcula as agregações e monta o texto completo do relatório"""
+    # Carregar fluxo já limpo e normalizado (cache Parquet compartilhado entre os
+    # scripts: o CSV só é reprocessado quando for mais novo que o cache)
+    df = carregar_fluxo(colunas=['Grupo', 'Conta', 'Entrada', 'Saida', 'Saldo', 'Transferencia'])
+    
+    # Colunas numéricas como arrays NumPy, reaproveitadas em todas as agregações
+    mask_transf = df['Transferencia'].to_numpy()
+    valores = {
+        'entrada': df['Entrada'].to_numpy(),
+        'saida': df['Saida'].to_numpy(),
+        'saldo': df['Saldo'].to_numpy()
+    }
+    
+    # Relatório montado em memória e escrito de uma vez no final
+    relatorio = []
+    
+    relatorio.append(LINHA)
+    relatorio.append("INVESTIGACAO: LIQUIDO DE TRANSFERENCIAS R$ 90.074,15")
+    relatorio.append(LINHA)
+    
+    # Filtrar transferências (marcador pré-calculado pelo loader)
+    df_transf = df[df['Transferencia']]
+    
+    relatorio.append(f"\nTotal de transacoes de transferencia: {len(df_transf)}")
+    
+    # Calcular por conta
+    relatorio.append("\n" + LINHA)
+    relatorio.append("SALDO DE TRANSFERENCIAS POR CONTA BANCARIA")
+    relatorio.append(LINHA)
+    
+    # Uma única agregação por conta (ordem de aparição, como o unique())
+    transf_por_conta = agregar_por_categoria(df['Conta'], valores, mask_transf)
+    
+    for conta, row in transf_por_conta.iterrows():
+        relatorio.append(f"\n{conta}")
+        relatorio.append(f"   Entradas:   {BR(row.entrada)}")
+        relatorio.append(f"   Saidas:     {BR(abs(row.saida))}")
+        relatorio.append(f"   Saldo:      {BR(row.saldo)}")
+        relatorio.append(f"   Transacoes: {int(row.n)}")
+    
+    # Total de transferências
+    total_entrada_transf = df_transf['Entrada'].sum()
+    total_saida_transf = df_transf['Saida'].sum()
+    total_saldo_transf = df_transf['Saldo'].sum()
+    
+    relatorio.append("\n" + LINHA)
+    relatorio.append("TOTAL DE TRANSFERENCIAS (deveria ser ~zero)")
+    relatorio.append(LINHA)
+    relatorio.append(f"Entradas:   {BR(total_entrada_transf)}")
+    relatorio.append(f"Saidas:     {BR(abs(total_saida_transf))}")
+    relatorio.append(f"Liquido:    {BR(total_saldo_transf)} <- ESTE E O VALOR QUE PROCURAMOS!")
+    
+    # Saldo total por conta (todas as transações)
+    relatorio.append("\n" + LINHA)
+    relatorio.append("SALDO TOTAL POR CONTA (TODAS AS TRANSACOES)")
+    relatorio.append(LINHA)
+    
+    saldo_por_conta = agregar_por_categoria(df['Conta'], {'saldo': valores['saldo']})['saldo']
+    
+    for conta, saldo_total in saldo_por_conta.items():
+        relatorio.append(FORMATO_SALDO_CONTA.format(conta, BR(saldo_total)))
+    
+    # Consolidado (lido do mesmo agregado por conta)
+    saldo_lifecon5 = saldo_por_conta.get('FluxoLifecon5', 0.0)
+    saldo_lifecon7 = saldo_por_conta.get('FluxoLifecon7', 0.0)
+    saldo_agata = saldo_por_conta.get('FluxoAgata', 0.0)
+    saldo_bariloche = saldo_por_conta.get('FluxoBariloche', 0.0)
+    
+    relatorio.append("\n" + LINHA)
+    relatorio.append("CONSOLIDADO POR PROJETO")
+    relatorio.append(LINHA)
+    relatorio.append(f"NORTHSIDE (Lifecon5 + Lifecon7): {BR(saldo_lifecon5 + saldo_lifecon7)}")
+    relatorio.append(f"AGATA:                            {BR(saldo_agata)}")
+    relatorio.append(f"BARILOCHE:                        {BR(saldo_bariloche)}")
+    relatorio.append(SEPARADOR)
+    relatorio.append(f"TOTAL:                            {BR(saldo_lifecon5 + saldo_lifecon7 + saldo_agata + saldo_bariloche)}")
+    
+    # Transferências por grupo
+    relatorio.append("\n" + LINHA)
+    relatorio.append("TRANSFERENCIAS DETALHADAS POR GRUPO")
+    relatorio.append(LINHA)
+    
+    transf_por_grupo = agregar_por_categoria(df['Grupo'], valores, mask_transf)
+    
+    for grupo in ['NORTHSIDE', 'AGATA', 'BARILOCHE']:
+        if grupo in transf_por_grupo.index:
+            row = transf_por_grupo.loc[grupo]
+            
+            relatorio.append(f"\n{grupo}")
+            relatorio.append(f"   Entradas:   {BR(row.entrada)}")
+            relatorio.append(f"   Saidas:     {BR(abs(row.saida))}")
+            relatorio.append(f"   Liquido:    {BR(row.saldo)}")
+            relatorio.append(f"   Transacoes: {int(row.n)}")
+    
+    relatorio.append("\n" + LINHA)
+    relatorio.append("ANALISE CONCLUIDA")
+    relatorio.append(LINHA)
+    
+    return '\n'.join(relatorio) + '\n'
 
-# Limpar nomes de colunas
-df.columns = df.columns.str.replace('Content.', '', regex=False)
 
-# Limpar valores monetários
-def limpar_valor(valor_str):
-    if pd.isna(valor_str) or valor_str == '':
-        return 0.0
-    valor_limpo = str(valor_str).strip().replace('.', '').replace(',', '.')
+def main():
+    chave = chave_conteudo()
+    
+    # CSV inalterado: reaproveita o relatório já montado, sem recalcular nada
+    if os.path.exists(CACHE_RELATORIO):
+        with open(CACHE_RELATORIO, encoding='utf-8') as f:
+            chave_cache, _, relatorio = f.read().partition('\n')
+        if chave_cache == chave:
+            sys.stdout.write(relatorio)
+            return
+    
+    relatorio = montar_relatorio()
+    
     try:
-        return float(valor_limpo)
-    except:
-        return 0.0
-
-df['Entrada'] = df['Entrada (R$)'].apply(limpar_valor)
-df['Saida'] = df['Saída (R$)'].apply(limpar_valor)
-
-# Garantir que saída seja negativa
-df.loc[df['Saida'] > 0, 'Saida'] = -df.loc[df['Saida'] > 0, 'Saida'].abs()
-
-# Calcular saldo
-df['Saldo'] = df['Entrada'] + df['Saida']
-
-# Normalizar textos
-df['Natureza'] = df['Natureza'].fillna('').str.upper()
-df['Conta'] = df['Name'].fillna('').str.strip()
-df['Grupo'] = df['Grupo'].fillna('').str.upper()
-
-print("="*80)
-print("INVESTIGACAO: LIQUIDO DE TRANSFERENCIAS R$ 90.074,15")
-print("="*80)
-
-# Filtrar transferências
-df_transf = df[df['Natureza'].str.contains('TRANSF. ENTRE CONTAS', na=False)].copy()
-
-print(f"\nTotal de transacoes de transferencia: {len(df_transf)}")
-
-# Calcular por conta
-print("\n" + "="*80)
-print("SALDO DE TRANSFERENCIAS POR CONTA BANCARIA")
-print("="*80)
-
-for conta in df_transf['Conta'].unique():
-    df_conta = df_transf[df_transf['Conta'] == conta]
-    entrada = df_conta['Entrada'].sum()
-    saida = df_conta['Saida'].sum()
-    saldo = df_conta['Saldo'].sum()
-    
-    print(f"\n{conta}")
-    print(f"   Entradas:   {BR(entrada)}")
-    print(f"   Saidas:     {BR(abs(saida))}")
-    print(f"   Saldo:      {BR(saldo)}")
-    print(f"   Transacoes: {len(df_conta)}")
-
-# Total de transferências
-total_entrada_transf = df_transf['Entrada'].sum()
-total_saida_transf = df_transf['Saida'].sum()
-total_saldo_transf = df_transf['Saldo'].sum()
-
-print("\n" + "="*80)
-print("TOTAL DE TRANSFERENCIAS (deveria ser ~zero)")
-print("="*80)
-print(f"Entradas:   {BR(total_entrada_transf)}")
-print(f"Saidas:     {BR(abs(total_saida_transf))}")
-print(f"Liquido:    {BR(total_saldo_transf)} <- ESTE E O VALOR QUE PROCURAMOS!")
-
-# Saldo total por conta (todas as transações)
-print("\n" + "="*80)
-print("SALDO TOTAL POR CONTA (TODAS AS TRANSACOES)")
-print("="*80)
-
-for conta in df['Conta'].unique():
-    df_conta = df[df['Conta'] == conta]
-    saldo_total = df_conta['Saldo'].sum()
-    print(f"{conta:20} -> {BR(saldo_total)}")
-
-# Consolidado
-saldo_lifecon5 = df[df['Conta'] == 'FluxoLifecon5']['Saldo'].sum()
-saldo_lifecon7 = df[df['Conta'] == 'FluxoLifecon7']['Saldo'].sum()
-saldo_agata = df[df['Conta'] == 'FluxoAgata']['Saldo'].sum()
-saldo_bariloche = df[df['Conta'] == 'FluxoBariloche']['Saldo'].sum()
-
-print("\n" + "="*80)
-print("CONSOLIDADO POR PROJETO")
-print("="*80)
-print(f"NORTHSIDE (Lifecon5 + Lifecon7): {BR(saldo_lifecon5 + saldo_lifecon7)}")
-print(f"AGATA:                            {BR(saldo_agata)}")
-print(f"BARILOCHE:                        {BR(saldo_bariloche)}")
-print(f"{'-'*80}")
-print(f"TOTAL:                            {BR(saldo_lifecon5 + saldo_lifecon7 + saldo_agata + saldo_bariloche)}")
-
-# Transferências por grupo
-print("\n" + "="*80)
-print("TRANSFERENCIAS DETALHADAS POR GRUPO")
-print("="*80)
-
-for grupo in ['NORTHSIDE', 'AGATA', 'BARILOCHE']:
-    df_grupo = df_transf[df_transf['Grupo'] == grupo]
-    if len(df_grupo) > 0:
-        entrada = df_grupo['Entrada'].sum()
-        saida = df_grupo['Saida'].sum()
-        saldo = df_grupo['Saldo'].sum()
-        
-        print(f"\n{grupo}")
-        print(f"   Entradas:   {BR(entrada)}")
-        print(f"   Saidas:     {BR(abs(saida))}")
-        print(f"   Liquido:    {BR(saldo)}")
-        print(f"   Transacoes: {len(df_grupo)}")
-
-print("\n" + "="*80)
-print("ANALISE CONCLUIDA")
-print("="*80)
+        with open(CACHE_RELATORIO, 'w', encoding='utf-8') as f:
+            f.write(chave + '\n' + relatorio)
+    except OSError:
+        # Sem permissão de escrita: segue sem cache
+        pass
+    
+    sys.stdout.write(relatorio)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,12 @@ Inicia o Streamlit automaticamente e abre no navegador
 import sys
 import subprocess
 import webbrowser
-import time
+import threading
 from pathlib import Path
 
+# Tempo máximo (s) aguardando o Streamlit anunciar que está no ar
+TEMPO_MAXIMO_INICIO = 30
+
 def main():
     print("="*60)
     print("📊 DASHBOARD FINANCEIRO - INICIANDO...")
@@ -45,16 +48,29 @@ def main():
             "--browser.gatherUsageStats=false"
         ]
         
-        # Iniciar processo em background
+        # Iniciar processo em background (stderr herda o console: um PIPE
+        # nunca lido enche e trava o Streamlit; o stdout é consumido abaixo)
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stderr=None,
+            text=True,
+            errors="replace",
+            bufsize=1
         )
         
-        # Aguardar servidor iniciar
-        time.sleep(3)
+        # Aguardar servidor iniciar: lê a saída até o Streamlit mostrar a URL
+        # (em vez de uma espera fixa); a thread segue consumindo o stdout
+        pronto = threading.Event()
+        
+        def acompanhar_saida():
+            for linha in process.stdout:
+                if "You can now view" in linha or "Local URL" in linha:
+                    pronto.set()
+            pronto.set()  # Processo encerrado: não há mais o que esperar
+        
+        threading.Thread(target=acompanhar_saida, daemon=True).start()
+        pronto.wait(timeout=TEMPO_MAXIMO_INICIO)
         
         # Abrir navegador
         url = "http://localhost:8501"
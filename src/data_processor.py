@@ -7,7 +7,7 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
-from .utils import limpar_valor_monetario, extrair_ano_mes
+from .utils import limpar_valor_monetario_vetorizado
 
 
 class DataProcessor:
@@ -23,7 +23,6 @@ class DataProcessor:
         Args:
             df: DataFrame com dados brutos
         """
-        self.df_original = df.copy()
         self.df = self._processar_dados_iniciais(df)
         
         # Classificar tipos de transação (camada de domínio)
@@ -31,7 +30,8 @@ class DataProcessor:
         
         # Cache para visões especializadas
         self._df_operacional_cache = None
-        self._df_por_conta_cache = None
+        self._valores_unicos_cache = {}
+        self._agrupamentos_cache = {}
     
     def _processar_dados_iniciais(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -43,29 +43,31 @@ class DataProcessor:
         Returns:
             DataFrame processado
         """
-        df = df.copy()
-        
-        # Renomear colunas removendo "Content."
-        df.columns = df.columns.str.replace('Content.', '', regex=False)
+        # Renomear colunas removendo "Content." (rename devolve um novo frame:
+        # o DataFrame recebido não é alterado, sem precisar de um copy() inteiro)
+        df = df.rename(columns=lambda col: col.replace('Content.', ''))
         
         # Converter data
         df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y', errors='coerce')
         
-        # Limpar valores monetários
-        df['Entrada'] = df['Entrada (R$)'].apply(limpar_valor_monetario)
-        df['Saida'] = df['Saída (R$)'].apply(limpar_valor_monetario)
+        # Limpar valores monetários (vetorizado, sem chamada Python por célula)
+        df['Entrada'] = limpar_valor_monetario_vetorizado(df['Entrada (R$)'])
+        df['Saida'] = limpar_valor_monetario_vetorizado(df['Saída (R$)'])
         
         # NORMALIZAR SAÍDA: garantir que seja sempre negativa
-        # Se vier positiva, inverter o sinal (conforme especificação do Excel)
-        df.loc[df['Saida'] > 0, 'Saida'] = -df.loc[df['Saida'] > 0, 'Saida'].abs()
+        # Se vier positiva, inverter o sinal (conforme especificação do Excel);
+        # uma única passada in-place sobre o array (where= mantém zeros como 0.0)
+        saida = df['Saida'].to_numpy(dtype=np.float64, copy=True)
+        np.negative(saida, out=saida, where=saida > 0)
+        df['Saida'] = saida
         
-        # Calcular saldo (entrada + saída, sendo saída negativa)
-        df['Saldo'] = df['Entrada'] + df['Saida']
+        # Calcular saldo (entrada + saída, sendo saída negativa), sem alinhamento de índice
+        df['Saldo'] = df['Entrada'].to_numpy() + saida
         
         # Criar colunas auxiliares
         df['Ano'] = df['Data'].dt.year
         df['Mes'] = df['Data'].dt.month
-        df['AnoMes'] = df['Data'].apply(extrair_ano_mes)
+        df['AnoMes'] = df['Data'].dt.strftime('%Y-%m')
         df['Trimestre'] = df['Data'].dt.quarter
         
         # Processar coluna de Conta Bancária (Name)
@@ -74,20 +76,38 @@ class DataProcessor:
         else:
             df['Conta'] = 'NÃO INFORMADO'
         
-        # Normalizar textos
+        # Normalizar textos (fillna depois do .str: também aceita colunas categóricas)
         for col in ['Grupo', 'Subgrupo', 'Natureza', 'FORNECEDOR']:
             if col in df.columns:
-                df[col] = df[col].fillna('NÃO INFORMADO').str.strip().str.upper()
+                df[col] = df[col].str.strip().str.upper().fillna('NÃO INFORMADO')
         
         # REGRA GLOBAL: Renomear NORTHSIDE para RITHMO
         # Todos os registros com Grupo "NORTHSIDE" serão exibidos como "RITHMO" na interface
         if 'Grupo' in df.columns:
             df.loc[df['Grupo'] == 'NORTHSIDE', 'Grupo'] = 'RITHMO'
         
+        # Texto de busca pré-calculado (fornecedor | natureza | grupo, minúsculo):
+        # a busca da tabela detalhada varre uma única coluna
+        colunas_busca = [col for col in ['FORNECEDOR', 'Natureza', 'Grupo'] if col in df.columns]
+        if colunas_busca:
+            # Concatenação coluna a coluna (vetorizada), sem chamada Python por linha;
+            # ausentes viram '' para não anular a busca nas demais colunas
+            texto_busca = df[colunas_busca[0]].fillna('').astype(str)
+            for col in colunas_busca[1:]:
+                texto_busca = texto_busca + '|' + df[col].fillna('').astype(str)
+            df['TextoBusca'] = texto_busca.str.lower()
+        
+        # Colunas de texto repetitivas como categóricas: groupby, filtros por
+        # igualdade e unique() passam a operar sobre códigos inteiros
+        for col in ['Grupo', 'Subgrupo', 'Natureza', 'FORNECEDOR', 'Conta']:
+            if col in df.columns:
+                df[col] = df[col].astype('category')
+        
         # Remover linhas com data inválida
         df = df.dropna(subset=['Data'])
         
-        # Ordenar por data
+        # Ordenar por data uma única vez: filtros preservam a ordem, então
+        # mínimo/máximo de qualquer recorte ficam na primeira/última linha
         df = df.sort_values('Data')
         
         return df
@@ -107,43 +127,41 @@ class DataProcessor:
         Returns:
             DataFrame com coluna 'TipoTransacao' adicionada
         """
-        df = df.copy()
-        
-        # Função auxiliar para classificar baseado na Natureza e Subgrupo
-        def classificar(row):
-            natureza = str(row['Natureza']).upper()
-            subgrupo = str(row['Subgrupo']).upper()
-            
-            # FINANCEIRO_INTERNO: Transferências entre contas (movimentações que se anulam)
-            if 'TRANSF. ENTRE CONTAS' in natureza or 'TRANSFERÊNCIA ENTRE CONTAS' in natureza:
-                return 'FINANCEIRO_INTERNO'
-            
-            # FINANCEIRO_INTERNO: Empréstimos internos (entrada e saída se cancelam)
-            if 'EMPRÉSTIMO' in natureza and subgrupo == 'FINANCEIRO':
-                return 'FINANCEIRO_INTERNO'
-
-            # FINANCEIRO_INTERNO: Pagamentos indevidos / estornos (entrada e saída se anulam)
-            if 'PAGAMENTOS INDEVIDOS (ENTRADA)' in natureza or 'PAGAMENTOS INDEVIDOS (SAIDA)' in natureza:
-                return 'FINANCEIRO_INTERNO'
-
-            # FINANCEIRO_EXTERNO: Movimentações financeiras reais
-            if subgrupo == 'FINANCEIRO':
-                # Aportes, receitas de aplicações, taxas bancárias são FINANCEIRO_EXTERNO
-                if any(keyword in natureza for keyword in [
-                    'APORTE', 'SCP', 'RECEITA APLICAÇÕES', 'APLICAÇÕES FINANCEIRAS',
-                    'OUTRAS RECEITAS FINANCEIRAS', 'RESULTADO DE PARTIC. SOCIETÁRIAS'
-                ]):
-                    return 'FINANCEIRO_EXTERNO'
-                # Empréstimos de terceiros são FINANCEIRO_EXTERNO
-                if 'EMPRÉSTIMO' in natureza and 'ENTRE CONTAS' not in natureza:
-                    return 'FINANCEIRO_EXTERNO'
-                # Default para FINANCEIRO que não se encaixa nas regras acima
-                return 'FINANCEIRO_EXTERNO'
-            
-            # OPERACIONAL: Tudo que não é financeiro (custo do ativo, administração, receitas)
-            return 'OPERACIONAL'
-        
-        df['TipoTransacao'] = df.apply(classificar, axis=1)
+        # Máscaras por regra, avaliadas de uma vez na coluna inteira (em colunas
+        # categóricas o .str roda só sobre as categorias distintas); Natureza e
+        # Subgrupo já chegam em maiúsculas de _processar_dados_iniciais
+        natureza = df['Natureza']
+        eh_financeiro = (df['Subgrupo'] == 'FINANCEIRO').to_numpy()
+        
+        # FINANCEIRO_INTERNO: Transferências entre contas (movimentações que se anulam)
+        eh_transferencia = (
+            natureza.str.contains('TRANSF. ENTRE CONTAS', regex=False) |
+            natureza.str.contains('TRANSFERÊNCIA ENTRE CONTAS', regex=False)
+        ).to_numpy()
+        
+        # FINANCEIRO_INTERNO: Empréstimos internos (entrada e saída se cancelam)
+        eh_emprestimo_interno = natureza.str.contains('EMPRÉSTIMO', regex=False).to_numpy() & eh_financeiro
+        
+        # FINANCEIRO_INTERNO: Pagamentos indevidos / estornos (entrada e saída se anulam)
+        eh_pagamento_indevido = (
+            natureza.str.contains('PAGAMENTOS INDEVIDOS (ENTRADA)', regex=False) |
+            natureza.str.contains('PAGAMENTOS INDEVIDOS (SAIDA)', regex=False)
+        ).to_numpy()
+        
+        # FINANCEIRO_EXTERNO: Demais movimentações do subgrupo FINANCEIRO (aportes,
+        # receitas de aplicações, taxas, empréstimos de terceiros...)
+        # OPERACIONAL: Tudo que não é financeiro (custo do ativo, administração, receitas)
+        # (np.select respeita a ordem: a primeira regra verdadeira vence)
+        # Três valores possíveis: guardado como categórica (códigos int8)
+        tipos = np.select(
+            [eh_transferencia, eh_emprestimo_interno, eh_pagamento_indevido, eh_financeiro],
+            ['FINANCEIRO_INTERNO', 'FINANCEIRO_INTERNO', 'FINANCEIRO_INTERNO', 'FINANCEIRO_EXTERNO'],
+            default='OPERACIONAL'
+        )
+        df['TipoTransacao'] = pd.Categorical(
+            tipos,
+            categories=['OPERACIONAL', 'FINANCEIRO_EXTERNO', 'FINANCEIRO_INTERNO']
+        )
         
         return df
     
@@ -159,9 +177,10 @@ class DataProcessor:
             DataFrame apenas com transações OPERACIONAL e FINANCEIRO_EXTERNO
         """
         if self._df_operacional_cache is None:
+            # Indexação booleana já devolve um frame novo (sem copy() extra)
             self._df_operacional_cache = self.df[
                 self.df['TipoTransacao'] != 'FINANCEIRO_INTERNO'
-            ].copy()
+            ]
         return self._df_operacional_cache
     
     @property
@@ -175,9 +194,8 @@ class DataProcessor:
         Returns:
             DataFrame completo com todas as transações
         """
-        if self._df_por_conta_cache is None:
-            self._df_por_conta_cache = self.df.copy()
-        return self._df_por_conta_cache
+        # Somente leitura: devolve o próprio self.df, sem duplicar o frame
+        return self.df
     
     def obter_df_filtrado(self, 
                           data_inicio: Optional[datetime] = None,
@@ -198,27 +216,39 @@ class DataProcessor:
         Returns:
             DataFrame filtrado
         """
-        df = self.df.copy()
-        
-        # Filtro de data
+        # Filtro de data: self.df está ordenado por Data, então o período é
+        # uma faixa contínua de linhas (busca binária em vez de máscaras)
+        inicio, fim = 0, len(self.df)
         if data_inicio:
-            df = df[df['Data'] >= pd.Timestamp(data_inicio)]
+            inicio = self.df['Data'].searchsorted(pd.Timestamp(data_inicio), side='left')
         if data_fim:
-            df = df[df['Data'] <= pd.Timestamp(data_fim)]
+            fim = self.df['Data'].searchsorted(pd.Timestamp(data_fim), side='right')
+        # Período completo: reaproveita o próprio self.df (e os agrupamentos em cache)
+        df = self.df if (inicio == 0 and fim == len(self.df)) else self.df.iloc[inicio:fim]
+        
+        # Demais filtros combinados numa única máscara sobre a faixa já reduzida
+        mascara = None
         
         # Filtro de grupos
         if grupos and len(grupos) > 0:
-            df = df[df['Grupo'].isin(grupos)]
+            mascara = df['Grupo'].isin(grupos).to_numpy()
         
         # Filtro de fornecedores
         if fornecedores and len(fornecedores) > 0:
-            df = df[df['FORNECEDOR'].isin(fornecedores)]
+            condicao = df['FORNECEDOR'].isin(fornecedores).to_numpy()
+            mascara = condicao if mascara is None else mascara & condicao
         
         # Filtro de naturezas
         if naturezas and len(naturezas) > 0:
-            df = df[df['Natureza'].isin(naturezas)]
+            condicao = df['Natureza'].isin(naturezas).to_numpy()
+            mascara = condicao if mascara is None else mascara & condicao
         
-        return df
+        # Sem filtros categóricos (ou todos atendidos) a faixa já é o resultado:
+        # evita materializar uma cópia idêntica das linhas
+        if mascara is None or mascara.all():
+            return df
+        
+        return df[mascara]
     
     def calcular_kpis(self, df: Optional[pd.DataFrame] = None) -> Dict[str, float]:
         """
@@ -233,28 +263,23 @@ class DataProcessor:
         if df is None:
             df = self.df
         
-        total_entrada = df['Entrada'].sum()
-        total_saida = abs(df['Saida'].sum())
+        # Somas e média numa única chamada de agregação
+        estatisticas = df[['Entrada', 'Saida', 'Saldo']].agg(['sum', 'mean'])
+        total_entrada = estatisticas.at['sum', 'Entrada']
+        total_saida = abs(estatisticas.at['sum', 'Saida'])
         saldo = total_entrada - total_saida
         
-        # Variação mês atual vs anterior (se houver dados suficientes)
+        # Variação mês atual vs anterior (se houver dados suficientes):
+        # saldos de todos os meses num único groupby, lidos os dois últimos
+        variacao = 0.0
         if len(df) > 0 and 'AnoMes' in df.columns:
-            meses_unicos = sorted(df['AnoMes'].unique())
-            if len(meses_unicos) >= 2:
-                mes_atual = meses_unicos[-1]
-                mes_anterior = meses_unicos[-2]
-                
-                saldo_atual = df[df['AnoMes'] == mes_atual]['Saldo'].sum()
-                saldo_anterior = df[df['AnoMes'] == mes_anterior]['Saldo'].sum()
+            saldos_mensais = df.groupby('AnoMes', sort=True)['Saldo'].sum()
+            if len(saldos_mensais) >= 2:
+                saldo_atual = saldos_mensais.iloc[-1]
+                saldo_anterior = saldos_mensais.iloc[-2]
                 
                 if saldo_anterior != 0:
                     variacao = ((saldo_atual - saldo_anterior) / abs(saldo_anterior)) * 100
-                else:
-                    variacao = 0.0
-            else:
-                variacao = 0.0
-        else:
-            variacao = 0.0
         
         return {
             'total_entrada': total_entrada,
@@ -262,7 +287,7 @@ class DataProcessor:
             'saldo': saldo,
             'variacao_percentual': variacao,
             'num_transacoes': len(df),
-            'ticket_medio': abs(df['Saldo'].mean()) if len(df) > 0 else 0.0
+            'ticket_medio': abs(estatisticas.at['mean', 'Saldo']) if len(df) > 0 else 0.0
         }
     
     def agregacao_temporal(self, df: Optional[pd.DataFrame] = None, 
@@ -281,8 +306,7 @@ class DataProcessor:
             df = self.df
         
         # Agrupar por data
-        df_temp = df.copy()
-        df_temp = df_temp.set_index('Data')
+        df_temp = df.set_index('Data')
         
         # Reagrupar por frequência (ME = Month End)
         agregado = df_temp.resample(freq).agg({
@@ -314,11 +338,15 @@ class DataProcessor:
         
         coluna = 'Entrada' if tipo == 'entrada' else 'Saida'
         
-        top = df.groupby('FORNECEDOR')[coluna].sum().reset_index()
-        top['Valor_Abs'] = top[coluna].abs()
-        top = top.sort_values('Valor_Abs', ascending=False).head(n)
+        # Só os n maiores em módulo (seleção parcial em vez de ordenar todos)
+        totais = self._agrupar(df, 'FORNECEDOR')[coluna].sum()
+        valor_abs = totais.abs().nlargest(n)
         
-        return top
+        return pd.DataFrame({
+            'FORNECEDOR': valor_abs.index,
+            coluna: totais.loc[valor_abs.index].to_numpy(),
+            'Valor_Abs': valor_abs.to_numpy()
+        })
     
     def agregacao_por_grupo(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """
@@ -333,7 +361,7 @@ class DataProcessor:
         if df is None:
             df = self.df
         
-        agregado = df.groupby('Grupo').agg({
+        agregado = self._agrupar(df, 'Grupo').agg({
             'Entrada': 'sum',
             'Saida': 'sum',
             'Saldo': 'sum'
@@ -357,7 +385,7 @@ class DataProcessor:
         if df is None:
             df = self.df
         
-        agregado = df.groupby(['Subgrupo', 'Natureza']).agg({
+        agregado = self._agrupar(df, ['Subgrupo', 'Natureza']).agg({
             'Entrada': 'sum',
             'Saida': 'sum',
             'Saldo': 'sum'
@@ -368,6 +396,29 @@ class DataProcessor:
         
         return agregado
     
+    def _agrupar(self, df: pd.DataFrame, chaves):
+        """
+        Retorna o groupby de df pelas chaves informadas
+        
+        Sobre o próprio self.df o objeto groupby (com os índices dos grupos já
+        calculados) é guardado e reaproveitado entre chamadas; recortes
+        filtrados recebem um groupby novo.
+        
+        Args:
+            df: DataFrame a agrupar
+            chaves: Coluna ou lista de colunas de agrupamento
+            
+        Returns:
+            DataFrameGroupBy
+        """
+        if df is not self.df:
+            return df.groupby(chaves, observed=True, sort=False)
+        
+        chave_cache = tuple(chaves) if isinstance(chaves, list) else (chaves,)
+        if chave_cache not in self._agrupamentos_cache:
+            self._agrupamentos_cache[chave_cache] = self.df.groupby(chaves, observed=True, sort=False)
+        return self._agrupamentos_cache[chave_cache]
+    
     def obter_periodos_disponiveis(self) -> Tuple[datetime, datetime]:
         """
         Retorna período mínimo e máximo disponível nos dados
@@ -375,8 +426,9 @@ class DataProcessor:
         Returns:
             Tuple com (data_minima, data_maxima)
         """
-        return (self.df['Data'].min().to_pydatetime(), 
-                self.df['Data'].max().to_pydatetime())
+        # self.df já está ordenado por Data
+        return (self.df['Data'].iloc[0].to_pydatetime(), 
+                self.df['Data'].iloc[-1].to_pydatetime())
     
     def obter_valores_unicos(self, coluna: str) -> List[str]:
         """
@@ -391,7 +443,11 @@ class DataProcessor:
         if coluna not in self.df.columns:
             return []
         
-        return sorted(self.df[coluna].unique().tolist())
+        # Dados não mudam após o carregamento: calcula uma vez por coluna
+        if coluna not in self._valores_unicos_cache:
+            self._valores_unicos_cache[coluna] = sorted(self.df[coluna].unique().tolist())
+        
+        return list(self._valores_unicos_cache[coluna])
     
     def filtrar_excluir_financeiro(self, df: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """
@@ -415,7 +471,7 @@ class DataProcessor:
             ~df['Natureza'].str.contains('EMPRÉSTIMOS', case=False, na=False)
         )
         
-        return df[mask].copy()
+        return df[mask]
     
     def calcular_aportes_corrigidos(self, taxa_juros_mensal: float = 0.9477, 
                                     considerar_bariloche_como_pagamento: bool = False) -> Dict:
@@ -442,7 +498,7 @@ class DataProcessor:
                 'total_juros': 0.0,
                 'aportes_detalhados': pd.DataFrame(),
                 'data_base_calculo': datetime.now(),
-                'amortizacoes_bariloche': [],
+                'amortizacoes_bariloche': {'data': np.array([], dtype='datetime64[ns]'), 'valor': np.array([]), 'natureza': [], 'fornecedor': []},
                 'memorial_calculo': []
             }
         
@@ -453,60 +509,64 @@ class DataProcessor:
         taxa_decimal = taxa_juros_mensal / 100
         
         # Se considerar BARILOCHE como pagamento, obter todas as saídas BARILOCHE
-        amortizacoes = []
+        # (colunas em arrays paralelos: data, valor, natureza, fornecedor)
+        amortizacoes = {'data': np.array([], dtype='datetime64[ns]'), 'valor': np.array([]), 'natureza': [], 'fornecedor': []}
         if considerar_bariloche_como_pagamento:
             df_bariloche = self.df[
                 (self.df['Grupo'] == 'BARILOCHE') & 
                 (self.df['Saida'] < 0)
-            ].copy()
+            ]
             
             if len(df_bariloche) > 0:
                 # Ordenar por data
                 df_bariloche = df_bariloche.sort_values('Data')
-                amortizacoes = [
-                    {
-                        'data': row['Data'],
-                        'valor': abs(row['Saida']),
-                        'natureza': row['Natureza'],
-                        'fornecedor': row['FORNECEDOR']
-                    }
-                    for _, row in df_bariloche.iterrows()
-                ]
-        
-        if not considerar_bariloche_como_pagamento or len(amortizacoes) == 0:
+                amortizacoes = {
+                    'data': df_bariloche['Data'].to_numpy(),
+                    'valor': np.abs(df_bariloche['Saida'].to_numpy(dtype=np.float64)),
+                    'natureza': df_bariloche['Natureza'].tolist(),
+                    'fornecedor': df_bariloche['FORNECEDOR'].tolist()
+                }
+        
+        # Meses decorridos de cada aporte até a data base (vetorizado)
+        datas_aportes = df_aportes['Data']
+        meses_aportes = (
+            (data_base.year - datas_aportes.dt.year) * 12
+            + (data_base.month - datas_aportes.dt.month)
+            + (data_base.day - datas_aportes.dt.day) / 30
+        ).to_numpy(dtype=np.float64)
+        valores_originais = df_aportes['Entrada'].to_numpy(dtype=np.float64)
+        
+        if not considerar_bariloche_como_pagamento or len(amortizacoes['valor']) == 0:
             # CÁLCULO TRADICIONAL (sem considerar BARILOCHE) - por aporte individual
-            memorial_calculo = []
-            
-            def calcular_valor_corrigido_simples(row):
-                data_aporte = row['Data']
-                valor_original = row['Entrada']
-                
-                meses = (data_base.year - data_aporte.year) * 12 + (data_base.month - data_aporte.month)
-                meses += (data_base.day - data_aporte.day) / 30
-                valor_corrigido = valor_original * ((1 + taxa_decimal) ** meses)
-                
-                # Adicionar ao memorial de cálculo
-                memorial_calculo.append({
-                    'data_aporte': data_aporte.strftime('%d/%m/%Y'),
+            # Fator de juros compostos de todos os aportes numa única potência vetorizada
+            fatores = np.power(1 + taxa_decimal, meses_aportes)
+            valores_corrigidos = valores_originais * fatores
+            juros = valores_corrigidos - valores_originais
+            
+            # Memorial de cálculo (uma linha por aporte)
+            memorial_calculo = [
+                {
+                    'data_aporte': data_aporte,
                     'valor_original': valor_original,
                     'meses_decorridos': round(meses, 4),
                     'taxa_mensal': taxa_juros_mensal,
-                    'fator_juros': round((1 + taxa_decimal) ** meses, 8),
+                    'fator_juros': round(fator, 8),
                     'valor_corrigido': round(valor_corrigido, 2),
                     'juros_acumulados': round(valor_corrigido - valor_original, 2),
                     'formula': f"R$ {valor_original:,.2f} × (1 + {taxa_decimal:.6f})^{meses:.4f} = R$ {valor_corrigido:,.2f}"
-                })
-                
-                return {
-                    'valor_corrigido': valor_corrigido,
-                    'meses_decorridos': meses,
-                    'juros_acumulados': valor_corrigido - valor_original
                 }
-            
-            df_aportes['Calculos'] = df_aportes.apply(calcular_valor_corrigido_simples, axis=1)
-            df_aportes['Valor_Corrigido'] = df_aportes['Calculos'].apply(lambda x: x['valor_corrigido'])
-            df_aportes['Meses_Decorridos'] = df_aportes['Calculos'].apply(lambda x: x['meses_decorridos'])
-            df_aportes['Juros_Acumulados'] = df_aportes['Calculos'].apply(lambda x: x['juros_acumulados'])
+                for data_aporte, valor_original, meses, fator, valor_corrigido in zip(
+                    datas_aportes.dt.strftime('%d/%m/%Y').tolist(),
+                    valores_originais.tolist(),
+                    meses_aportes.tolist(),
+                    fatores.tolist(),
+                    valores_corrigidos.tolist()
+                )
+            ]
+            
+            df_aportes['Valor_Corrigido'] = valores_corrigidos
+            df_aportes['Meses_Decorridos'] = meses_aportes
+            df_aportes['Juros_Acumulados'] = juros
             
             total_original = df_aportes['Entrada'].sum()
             total_corrigido = df_aportes['Valor_Corrigido'].sum()
@@ -517,32 +577,40 @@ class DataProcessor:
             memorial_calculo = []
             
             # Construir linha do tempo GLOBAL com todos aportes e amortizações
-            eventos = []
-            
-            # Adicionar todos os aportes
-            for _, row in df_aportes.iterrows():
-                eventos.append({
-                    'data': row['Data'],
-                    'tipo': 'aporte',
-                    'valor': row['Entrada'],
-                    'referencia': row
-                })
-            
-            # Adicionar todas as amortizações BARILOCHE
-            for amort in amortizacoes:
-                eventos.append({
-                    'data': amort['data'],
-                    'tipo': 'amortizacao',
-                    'valor': amort['valor'],
-                    'referencia': amort
-                })
-            
-            # Ordenar eventos cronologicamente
-            eventos = sorted(eventos, key=lambda x: x['data'])
-            
-            # Simular evolução do capital mês a mês
-            capital_acumulado = 0
-            ultima_data = eventos[0]['data']
+            # (arrays paralelos; ordenação estável mantém aportes antes das
+            # amortizações da mesma data)
+            datas_eventos = pd.DatetimeIndex(np.concatenate([datas_aportes.to_numpy(), amortizacoes['data']]))
+            valores_eventos = np.concatenate([valores_originais, amortizacoes['valor']])
+            eh_aporte = np.arange(len(valores_eventos)) < len(valores_originais)
+            
+            ordem = np.argsort(datas_eventos.values, kind='stable')
+            datas_eventos = datas_eventos[ordem]
+            valores_eventos = valores_eventos[ordem]
+            eh_aporte = eh_aporte[ordem]
+            
+            # Meses desde o evento anterior (o primeiro parte da própria data) e
+            # fatores de juros de todos os intervalos numa única potência vetorizada
+            anos = datas_eventos.year.to_numpy()
+            meses_cal = datas_eventos.month.to_numpy()
+            dias = datas_eventos.day.to_numpy()
+            anterior = np.concatenate(([0], np.arange(len(anos) - 1)))
+            meses_eventos = (
+                (anos - anos[anterior]) * 12
+                + (meses_cal - meses_cal[anterior])
+                + (dias - dias[anterior]) / 30
+            )
+            fatores_eventos = np.power(1 + taxa_decimal, meses_eventos)
+            
+            # Simular evolução do capital evento a evento (recorrência: o capital
+            # não fica negativo, então só esta parte segue sequencial)
+            eh_aporte_lista = eh_aporte.tolist()
+            valores_lista = valores_eventos.tolist()
+            meses_lista = meses_eventos.tolist()
+            fatores_lista = fatores_eventos.tolist()
+            capitais_antes, capitais_depois = self._simular_capital_bariloche(
+                eh_aporte_lista, valores_lista, meses_lista, fatores_lista
+            )
+            capital_acumulado = capitais_depois[-1]
             
             # Adicionar cabeçalho do memorial
             memorial_calculo.append({
@@ -559,47 +627,38 @@ class DataProcessor:
                 'capital_depois': 0
             })
             
-            # Processar cada evento
-            for i, evento in enumerate(eventos):
-                # Calcular juros desde última data até este evento
-                meses = (evento['data'].year - ultima_data.year) * 12
-                meses += (evento['data'].month - ultima_data.month)
-                meses += (evento['data'].day - ultima_data.day) / 30
-                
-                capital_antes_juros = capital_acumulado
-                
-                if meses > 0 and capital_acumulado > 0:
-                    # Aplicar juros compostos sobre capital acumulado
-                    capital_acumulado = capital_acumulado * ((1 + taxa_decimal) ** meses)
-                
-                capital_antes_evento = capital_acumulado
-                
-                # Aplicar o evento
-                if evento['tipo'] == 'aporte':
-                    capital_acumulado += evento['valor']
-                    evento_desc = f"APORTE: R$ {evento['valor']:,.2f}"
-                elif evento['tipo'] == 'amortizacao':
-                    capital_acumulado -= evento['valor']
-                    if capital_acumulado < 0:
-                        capital_acumulado = 0
-                    evento_desc = f"AMORTIZAÇÃO BARILOCHE: -R$ {evento['valor']:,.2f}"
-                
-                # Adicionar ao memorial
-                memorial_calculo.append({
-                    'data_aporte': evento['data'].strftime('%d/%m/%Y'),
-                    'valor_original': evento['valor'],
+            # Memorial de cada evento montado depois da simulação, a partir das
+            # listas já calculadas (datas formatadas numa única chamada)
+            descricoes = [
+                f"APORTE: R$ {valor:,.2f}" if aporte else f"AMORTIZAÇÃO BARILOCHE: -R$ {valor:,.2f}"
+                for aporte, valor in zip(eh_aporte_lista, valores_lista)
+            ]
+            memorial_calculo.extend(
+                {
+                    'data_aporte': data_evento,
+                    'valor_original': valor,
                     'meses_decorridos': round(meses, 4),
                     'taxa_mensal': taxa_juros_mensal,
-                    'fator_juros': round((1 + taxa_decimal) ** meses, 8) if meses > 0 else 1.0,
-                    'valor_corrigido': round(capital_acumulado, 2),
-                    'juros_acumulados': round(capital_acumulado - capital_antes_juros, 2),
-                    'formula': f"Capital: R$ {capital_antes_juros:,.2f} × (1 + {taxa_decimal:.6f})^{meses:.4f} + {evento_desc} = R$ {capital_acumulado:,.2f}",
+                    'fator_juros': round(fator, 8) if meses > 0 else 1.0,
+                    'valor_corrigido': round(capital_depois, 2),
+                    'juros_acumulados': round(capital_depois - capital_antes, 2),
+                    'formula': f"Capital: R$ {capital_antes:,.2f} × (1 + {taxa_decimal:.6f})^{meses:.4f} + {evento_desc} = R$ {capital_depois:,.2f}",
                     'evento': evento_desc,
-                    'capital_antes': round(capital_antes_juros, 2),
-                    'capital_depois': round(capital_acumulado, 2)
-                })
-                
-                ultima_data = evento['data']
+                    'capital_antes': round(capital_antes, 2),
+                    'capital_depois': round(capital_depois, 2)
+                }
+                for data_evento, valor, meses, fator, capital_antes, capital_depois, evento_desc in zip(
+                    datas_eventos.strftime('%d/%m/%Y').tolist(),
+                    valores_lista,
+                    meses_lista,
+                    fatores_lista,
+                    capitais_antes,
+                    capitais_depois,
+                    descricoes
+                )
+            )
+            
+            ultima_data = datas_eventos[-1]
             
             # Calcular juros desde último evento até data_base
             meses_final = (data_base.year - ultima_data.year) * 12
@@ -632,28 +691,17 @@ class DataProcessor:
             total_juros = total_corrigido - total_original
             
             # Para cada aporte individual, calcular proporcionalmente (para tabela detalhada)
-            def calcular_proporcional(row):
-                valor_original = row['Entrada']
-                proporcao = valor_original / total_original if total_original > 0 else 0
-                
-                meses = (data_base.year - row['Data'].year) * 12
-                meses += (data_base.month - row['Data'].month)
-                meses += (data_base.day - row['Data'].day) / 30
-                
-                # Valor corrigido proporcional ao total
-                valor_corrigido_prop = total_corrigido * proporcao
-                juros_prop = valor_corrigido_prop - valor_original
-                
-                return {
-                    'valor_corrigido': valor_corrigido_prop,
-                    'meses_decorridos': meses,
-                    'juros_acumulados': juros_prop
-                }
+            if total_original > 0:
+                proporcoes = valores_originais / total_original
+            else:
+                proporcoes = np.zeros(len(valores_originais))
+            
+            # Valor corrigido proporcional ao total
+            valores_corrigidos_prop = total_corrigido * proporcoes
             
-            df_aportes['Calculos'] = df_aportes.apply(calcular_proporcional, axis=1)
-            df_aportes['Valor_Corrigido'] = df_aportes['Calculos'].apply(lambda x: x['valor_corrigido'])
-            df_aportes['Meses_Decorridos'] = df_aportes['Calculos'].apply(lambda x: x['meses_decorridos'])
-            df_aportes['Juros_Acumulados'] = df_aportes['Calculos'].apply(lambda x: x['juros_acumulados'])
+            df_aportes['Valor_Corrigido'] = valores_corrigidos_prop
+            df_aportes['Meses_Decorridos'] = meses_aportes
+            df_aportes['Juros_Acumulados'] = valores_corrigidos_prop - valores_originais
         
         return {
             'total_aportes_original': total_original,
@@ -666,6 +714,44 @@ class DataProcessor:
             'memorial_calculo': memorial_calculo
         }
     
+    @staticmethod
+    def _simular_capital_bariloche(eh_aporte: List[bool], valores: List[float],
+                                   meses: List[float], fatores: List[float]) -> Tuple[List[float], List[float]]:
+        """
+        Evolução do capital evento a evento no modo BARILOCHE (só a recorrência numérica)
+        
+        Args:
+            eh_aporte: True para aporte, False para amortização (ordem cronológica)
+            valores: Valor de cada evento
+            meses: Meses desde o evento anterior
+            fatores: Fator de juros compostos de cada intervalo
+            
+        Returns:
+            Tuple: Capital antes dos juros e capital após o evento, por evento
+        """
+        capital = 0
+        capitais_antes = []
+        capitais_depois = []
+        
+        for aporte, valor, m, fator in zip(eh_aporte, valores, meses, fatores):
+            capitais_antes.append(capital)
+            
+            # Aplicar juros compostos sobre capital acumulado
+            if m > 0 and capital > 0:
+                capital = capital * fator
+            
+            # Aplicar o evento (amortização não deixa o capital negativo)
+            if aporte:
+                capital += valor
+            else:
+                capital -= valor
+                if capital < 0:
+                    capital = 0
+            
+            capitais_depois.append(capital)
+        
+        return capitais_antes, capitais_depois
+    
     def analise_subgrupo_financeiro(self) -> Dict:
         """
         Análise detalhada do subgrupo FINANCEIRO
@@ -673,7 +759,7 @@ class DataProcessor:
         Returns:
             Dict com análise financeira completa
         """
-        df_fin = self.df[self.df['Subgrupo'] == 'FINANCEIRO'].copy()
+        df_fin = self.df[self.df['Subgrupo'] == 'FINANCEIRO']
         
         if len(df_fin) == 0:
             return {
@@ -685,7 +771,7 @@ class DataProcessor:
             }
         
         # Agregação por natureza
-        por_natureza = df_fin.groupby('Natureza').agg({
+        por_natureza = df_fin.groupby('Natureza', observed=True, sort=False).agg({
             'Entrada': 'sum',
             'Saida': 'sum',
             'Saldo': 'sum'
@@ -693,10 +779,13 @@ class DataProcessor:
         
         por_natureza = por_natureza.sort_values('Saldo', ascending=False)
         
+        # Totais das três colunas numa única agregação
+        totais = df_fin[['Entrada', 'Saida', 'Saldo']].sum()
+        
         return {
-            'total_entradas': df_fin['Entrada'].sum(),
-            'total_saidas': abs(df_fin['Saida'].sum()),
-            'saldo': df_fin['Saldo'].sum(),
+            'total_entradas': totais['Entrada'],
+            'total_saidas': abs(totais['Saida']),
+            'saldo': totais['Saldo'],
             'num_transacoes': len(df_fin),
             'por_natureza': por_natureza,
             'df_financeiro': df_fin
@@ -718,16 +807,15 @@ class DataProcessor:
         if 'Conta' not in df.columns:
             return {}
         
-        # Saldos por conta individual
-        saldos_por_conta = {}
-        for conta in df['Conta'].unique():
-            df_conta = df[df['Conta'] == conta]
-            saldos_por_conta[conta] = {
-                'saldo': df_conta['Saldo'].sum(),
-                'entradas': df_conta['Entrada'].sum(),
-                'saidas': abs(df_conta['Saida'].sum()),
-                'transacoes': len(df_conta)
-            }
+        # Saldos por conta individual: uma única agregação (contas na ordem de aparição)
+        por_conta = df.groupby('Conta', observed=True, sort=False).agg(
+            saldo=('Saldo', 'sum'),
+            entradas=('Entrada', 'sum'),
+            saidas=('Saida', 'sum'),
+            transacoes=('Saldo', 'size')
+        )
+        por_conta['saidas'] = por_conta['saidas'].abs()
+        saldos_por_conta = por_conta.to_dict(orient='index')
         
         # Consolidar RITHMO (Lifecon5 + Lifecon7) - anteriormente NORTHSIDE
         saldo_lifecon5 = saldos_por_conta.get('FluxoLifecon5', {}).get('saldo', 0)
@@ -31,6 +31,27 @@ def limpar_valor_monetario(valor_str: str) -> float:
         return 0.0
 
 
+def limpar_valor_monetario_vetorizado(valores: pd.Series) -> pd.Series:
+    """
+    Versão vetorizada de limpar_valor_monetario para colunas inteiras
+    
+    Args:
+        valores: Series de strings no formato brasileiro (ex: "1.234,56")
+        
+    Returns:
+        pd.Series: Valores float64 (vazios/inválidos viram 0.0), mesmo índice da entrada
+    """
+    # Valores se repetem muito: limpa só os textos distintos e expande pelos códigos
+    codigos, distintos = pd.factorize(valores.fillna('').astype(str), sort=False)
+    numeros = pd.to_numeric(
+        pd.Series(distintos).str.strip()
+         .str.replace('.', '', regex=False)
+         .str.replace(',', '.', regex=False),
+        errors='coerce'
+    ).fillna(0.0).to_numpy(dtype=np.float64)
+    return pd.Series(numeros[codigos], index=valores.index)
+
+
 def formatar_moeda(valor: float, simbolo: str = "R$") -> str:
     """
     Formata valor numérico para string monetária brasileira
@@ -54,6 +75,68 @@ def formatar_moeda(valor: float, simbolo: str = "R$") -> str:
     return f"{sinal}{simbolo} {valor_formatado}"
 
 
+# Troca de separadores do formato americano para o brasileiro
+_TROCA_SEPARADORES = str.maketrans({',': '.', '.': ','})
+
+
+def formatar_moeda_vetorizado(valores, simbolo: str = "R$") -> np.ndarray:
+    """
+    Versão vetorizada de formatar_moeda para colunas inteiras
+    
+    Args:
+        valores: Array/Series de valores numéricos
+        simbolo: Símbolo da moeda
+        
+    Returns:
+        np.ndarray: Valores formatados (ex: "R$ 1.234,56"), mesma saída de formatar_moeda
+    """
+    valores = np.nan_to_num(np.asarray(valores, dtype=np.float64), nan=0.0)
+    
+    # Formata os módulos com separador de milhares e troca ',' <-> '.' numa só passada
+    corpo = np.array([f"{v:,.2f}" for v in np.abs(valores).tolist()], dtype=str)
+    corpo = np.char.translate(corpo, _TROCA_SEPARADORES)
+    
+    sinal = np.where(valores < 0, "-", "")
+    return np.char.add(np.char.add(sinal, f"{simbolo} "), corpo).astype(object)
+
+
+def gerar_csv_bytes(df: pd.DataFrame, sep: str = ";") -> bytes:
+    """
+    Serializa um DataFrame em CSV (UTF-8 com BOM, para abrir direto no Excel)
+    
+    Usa o escritor em C do PyArrow quando disponível; sem PyArrow (ou com
+    colunas que o Arrow não converte) cai no DataFrame.to_csv do pandas.
+    
+    Args:
+        df: DataFrame a exportar (o índice não é incluído)
+        sep: Separador de campos
+    
+    Returns:
+        bytes: Conteúdo do arquivo CSV
+    """
+    bom = "\ufeff".encode("utf-8")
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return bom + df.to_csv(index=False, sep=sep).encode("utf-8")
+    
+    # Datas no mesmo formato do pandas ("2024-01-31") em vez do timestamp do Arrow
+    df = df.copy()
+    for coluna in df.columns[df.dtypes.map(pd.api.types.is_datetime64_any_dtype)]:
+        df[coluna] = df[coluna].astype(str)
+    
+    try:
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        saida = pa.BufferOutputStream()
+        pacsv.write_csv(tabela, saida, pacsv.WriteOptions(delimiter=sep, quoting_style="needed"))
+    except pa.ArrowException:
+        return bom + df.to_csv(index=False, sep=sep).encode("utf-8")
+    
+    return bom + saida.getvalue().to_pybytes()
+
+
 def formatar_percentual(valor: float, decimais: int = 1) -> str:
     """
     Formata valor numérico para percentual
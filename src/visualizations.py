@@ -159,7 +159,7 @@ class Visualizations:
                     opacity=0.85,
                     cornerradius=8,
                 ),
-                text=df_top['Saida_Display'].apply(lambda x: f'R$ {x:,.0f}'),
+                text=df_top['Saida_Display'].map('R$ {:,.0f}'.format),
                 textposition='outside',
                 textfont=dict(size=13, color='white', family='Arial'),
                 hovertemplate='<b>%{y}</b><br>Saídas: R$ %{x:,.2f}<extra></extra>',
@@ -224,7 +224,7 @@ class Visualizations:
                 labels=df_plot['Label'],
                 parents=df_plot['Subgrupo'],
                 values=df_plot['Saida_Abs'],
-                text=df_plot['Saida_Abs'].apply(lambda x: f'R$ {x:,.2f}'),
+                text=df_plot['Saida_Abs'].map('R$ {:,.2f}'.format),
                 textposition='middle center',
                 marker=dict(
                     colorscale='RdYlGn_r',
@@ -268,7 +268,7 @@ class Visualizations:
                     opacity=0.85,
                     cornerradius=8,
                 ),
-                text=df_top['Valor_Abs'].apply(lambda x: f'R$ {x:,.0f}'),
+                text=df_top['Valor_Abs'].map('R$ {:,.0f}'.format),
                 textposition='outside',
                 textfont=dict(size=13, color='white', family='Arial'),
                 hovertemplate='<b>%{y}</b><br>Total: R$ %{x:,.2f}<extra></extra>',
@@ -307,7 +307,7 @@ class Visualizations:
         Returns:
             Figura Plotly
         """
-        df_subgrupo = df.groupby('Subgrupo')['Saida'].sum().abs().reset_index()
+        df_subgrupo = df.groupby('Subgrupo', observed=True)['Saida'].sum().abs().reset_index()
         df_subgrupo = df_subgrupo.sort_values('Saida', ascending=False).head(8)
         
         fig = go.Figure(
@@ -471,10 +471,7 @@ class Visualizations:
         df_plot = df_aportes.sort_values('Juros_Acumulados', ascending=True).tail(15).copy()
         
         # Criar label com grupo
-        df_plot['Label'] = df_plot.apply(
-            lambda x: f"{x['Grupo']} - {x['Data'].strftime('%m/%Y')}", 
-            axis=1
-        )
+        df_plot['Label'] = df_plot['Grupo'].astype(str) + ' - ' + df_plot['Data'].dt.strftime('%m/%Y')
         
         fig = go.Figure()
         
@@ -488,7 +485,7 @@ class Visualizations:
                     opacity=0.85,
                     cornerradius=8,
                 ),
-                text=df_plot['Juros_Acumulados'].apply(lambda x: f'R$ {x:,.0f}'),
+                text=df_plot['Juros_Acumulados'].map('R$ {:,.0f}'.format),
                 textposition='outside',
                 textfont=dict(size=13, color='white', family='Arial'),
                 hovertemplate='<b>%{y}</b><br>Juros: R$ %{x:,.2f}<extra></extra>',
@@ -626,7 +623,7 @@ class Visualizations:
         if len(df_financeiro) == 0:
             return go.Figure()
         
-        df_nat = df_financeiro.groupby('Natureza').agg({
+        df_nat = df_financeiro.groupby('Natureza', observed=True).agg({
             'Entrada': 'sum',
             'Saida': 'sum',
             'Saldo': 'sum'
@@ -651,7 +648,7 @@ class Visualizations:
                     orientation='h',
                     name='Entradas',
                     marker=dict(color=Visualizations.COLOR_ENTRADA, opacity=0.85, cornerradius=8),
-                    text=df_entradas['Entrada'].apply(lambda x: f'R$ {x:,.0f}'),
+                    text=df_entradas['Entrada'].map('R$ {:,.0f}'.format),
                     textposition='outside',
                     hovertemplate='<b>%{y}</b><br>Valor: R$ %{x:,.2f}<extra></extra>'
                 ),
@@ -667,7 +664,7 @@ class Visualizations:
                     orientation='h',
                     name='Saídas',
                     marker=dict(color=Visualizations.COLOR_SAIDA, opacity=0.85, cornerradius=8),
-                    text=df_saidas['Saida'].abs().apply(lambda x: f'R$ {x:,.0f}'),
+                    text=df_saidas['Saida'].abs().map('R$ {:,.0f}'.format),
                     textposition='outside',
                     hovertemplate='<b>%{y}</b><br>Valor: R$ %{x:,.2f}<extra></extra>'
                 ),
@@ -701,14 +698,14 @@ class Visualizations:
             Dicionário com chave (Grupo, Subgrupo) e valor (Figura Plotly)
         """
         # Agregar por Grupo, Subgrupo e Natureza
-        df_agregado = df.groupby(['Grupo', 'Subgrupo', 'Natureza'])['Saida'].sum().abs().reset_index()
+        df_agregado = df.groupby(['Grupo', 'Subgrupo', 'Natureza'], observed=True)['Saida'].sum().abs().reset_index()
         df_agregado = df_agregado[df_agregado['Saida'] > 0]  # Apenas despesas
         
         # Obter todas as combinações únicas de Grupo + Subgrupo
         combinacoes = df_agregado[['Grupo', 'Subgrupo']].drop_duplicates()
         
         # Calcular total por combinação para ordenar
-        totais = df_agregado.groupby(['Grupo', 'Subgrupo'])['Saida'].sum().reset_index()
+        totais = df_agregado.groupby(['Grupo', 'Subgrupo'], observed=True)['Saida'].sum().reset_index()
         totais.columns = ['Grupo', 'Subgrupo', 'Total']
         combinacoes = combinacoes.merge(totais, on=['Grupo', 'Subgrupo'])
         combinacoes = combinacoes.sort_values('Total', ascending=False)
@@ -750,7 +747,7 @@ class Visualizations:
                         opacity=0.85,
                         cornerradius=8,
                     ),
-                    text=df_combo['Saida'].apply(lambda x: f'R$ {x:,.0f}'),
+                    text=df_combo['Saida'].map('R$ {:,.0f}'.format),
                     textposition='outside',
                     textfont=dict(size=12, color='white', family='Arial'),
                     hovertemplate='<b>%{y}</b><br>Valor: R$ %{x:,.2f}<extra></extra>',
@@ -806,14 +803,14 @@ class Visualizations:
             Dicionário com chave (Grupo, Subgrupo) e valor (Figura Plotly)
         """
         # Agregar por Grupo, Subgrupo e Natureza - APENAS ENTRADAS
-        df_agregado = df.groupby(['Grupo', 'Subgrupo', 'Natureza'])['Entrada'].sum().reset_index()
+        df_agregado = df.groupby(['Grupo', 'Subgrupo', 'Natureza'], observed=True)['Entrada'].sum().reset_index()
         df_agregado = df_agregado[df_agregado['Entrada'] > 0]  # Apenas receitas
         
         # Obter todas as combinações únicas de Grupo + Subgrupo
         combinacoes = df_agregado[['Grupo', 'Subgrupo']].drop_duplicates()
         
         # Calcular total por combinação para ordenar
-        totais = df_agregado.groupby(['Grupo', 'Subgrupo'])['Entrada'].sum().reset_index()
+        totais = df_agregado.groupby(['Grupo', 'Subgrupo'], observed=True)['Entrada'].sum().reset_index()
         totais.columns = ['Grupo', 'Subgrupo', 'Total']
         combinacoes = combinacoes.merge(totais, on=['Grupo', 'Subgrupo'])
         combinacoes = combinacoes.sort_values('Total', ascending=False)
@@ -845,7 +842,7 @@ class Visualizations:
                         opacity=0.85,
                         cornerradius=8,
                     ),
-                    text=df_combo['Entrada'].apply(lambda x: f'R$ {x:,.0f}'),
+                    text=df_combo['Entrada'].map('R$ {:,.0f}'.format),
                     textposition='outside',
                     textfont=dict(size=12, color='white', family='Arial'),
                     hovertemplate='<b>%{y}</b><br>Receita: R$ %{x:,.2f}<extra></extra>',
@@ -905,7 +902,7 @@ class Visualizations:
         df_filtrado = df[(df['Grupo'] == grupo) & (df['Subgrupo'] == subgrupo)].copy()
         
         # Agregar por Natureza
-        df_agregado = df_filtrado.groupby('Natureza')['Saida'].sum().abs().reset_index()
+        df_agregado = df_filtrado.groupby('Natureza', observed=True)['Saida'].sum().abs().reset_index()
         df_agregado = df_agregado[df_agregado['Saida'] > 0]
         df_agregado = df_agregado.sort_values('Saida', ascending=True)
         
@@ -947,7 +944,7 @@ class Visualizations:
                     opacity=0.85,
                     cornerradius=8,
                 ),
-                text=df_agregado['Saida'].apply(lambda x: f'R$ {x:,.0f}'),
+                text=df_agregado['Saida'].map('R$ {:,.0f}'.format),
                 textposition='outside',
                 textfont=dict(size=12, color='white', family='Arial'),
                 hovertemplate='<b>%{y}</b><br>Valor: R$ %{x:,.2f}<extra></extra>',
@@ -1004,7 +1001,7 @@ class Visualizations:
         df_filtrado = df[(df['Grupo'] == grupo) & (df['Subgrupo'] == subgrupo)].copy()
         
         # Agregar por Natureza - ENTRADAS
-        df_agregado = df_filtrado.groupby('Natureza')['Entrada'].sum().reset_index()
+        df_agregado = df_filtrado.groupby('Natureza', observed=True)['Entrada'].sum().reset_index()
         df_agregado = df_agregado[df_agregado['Entrada'] > 0]
         df_agregado = df_agregado.sort_values('Entrada', ascending=True)
         
@@ -1037,7 +1034,7 @@ class Visualizations:
                     opacity=0.85,
                     cornerradius=8,
                 ),
-                text=df_agregado['Entrada'].apply(lambda x: f'R$ {x:,.0f}'),
+                text=df_agregado['Entrada'].map('R$ {:,.0f}'.format),
                 textposition='outside',
                 textfont=dict(size=12, color='white', family='Arial'),
                 hovertemplate='<b>%{y}</b><br>Receita: R$ %{x:,.2f}<extra></extra>',